@@ -0,0 +1,139 @@
+"""
+Raw HTML archive of fetched Goodreads pages, and offline reparsing from it.
+
+Pages are stored content-addressed (by the SHA-256 of their body) and gzip
+compressed under ``<root>/objects``, so identical pages are stored once. An
+append-only ``<root>/index.tsv`` maps every fetched URL to the digest of its
+latest body.
+
+``reparse`` rebuilds the book data of a run purely from the archive: list pages
+are read back to find the book links, and book pages are parsed in a pool of
+processes, without any network access.
+
+Usage Example:
+```python
+archive = Archive("archive")
+scraper.set_fetcher(Fetcher(archive=archive))   # archive while scraping
+books = list(reparse("archive", ["https://www.goodreads.com/list/show/1.Best"], "2025-11-01"))
+```
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from goodreads_miner.scraper import GOODREADS_URL, parse_book, parse_books
+
+
+class Archive:
+    """
+    Content-addressed, gzip-compressed store of page bodies keyed by URL.
+
+    Parameters:
+    - root (str | Path): Directory of the archive. Created if missing.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.index_path = self.root / "index.tsv"
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: dict[str, str] | None = None
+
+    def object_path(self, digest: str) -> Path:
+        """Returns the path of the compressed body with the given digest."""
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.gz"
+
+    def put(self, url: str, body: bytes) -> str:
+        """Stores ``body`` as the latest version of ``url`` and returns its digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp, "wb") as file:
+                file.write(body)
+            os.replace(tmp, path)
+        with self._lock:
+            with open(self.index_path, "a", encoding="utf8") as index:
+                index.write(f"{url}\t{digest}\n")
+            if self._index is not None:
+                self._index[url] = digest
+        return digest
+
+    def index(self) -> dict[str, str]:
+        """Returns the URL to digest mapping, loading it from disk on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                if self.index_path.exists():
+                    with open(self.index_path, encoding="utf8") as index:
+                        for line in index:
+                            url, _, digest = line.rstrip("\n").rpartition("\t")
+                            self._index[url] = digest
+            return self._index
+
+    def path(self, url: str) -> Path:
+        """Returns the object path of the latest body of ``url``. Raises KeyError if not archived."""
+        return self.object_path(self.index()[url])
+
+    def get(self, url: str) -> bytes:
+        """Returns the latest body archived for ``url``. Raises KeyError if not archived."""
+        return read_object(self.path(url))
+
+
+def read_object(path: str | Path) -> bytes:
+    """Reads and decompresses an archived body."""
+    with gzip.open(path, "rb") as file:
+        return file.read()
+
+
+def parse_archived(path: str, book_url: str, today: str) -> dict:
+    """Parses an archived book page. Runs in the worker processes of ``reparse``."""
+    return parse_book(read_object(path), book_url, today)
+
+
+def reparse(
+    root: str | Path,
+    list_urls: Iterable[str],
+    today: str,
+    workers: int | None = None,
+    on_missing=None,
+) -> Iterator[dict]:
+    """
+    Rebuilds the book data of the given lists from the archive, without network access.
+
+    Parameters:
+    - root (str | Path): Directory of the archive.
+    - list_urls (Iterable[str]): The list URLs of the original run.
+    - today (str): The date used as "Date Added".
+    - workers (int | None): Number of parsing processes. Default is the CPU count.
+    - on_missing (Callable | None): Called with every list or book URL absent from the archive.
+
+    Returns:
+    - Iterator[dict]: The book dicts, in list order.
+    """
+    archive = Archive(root)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for list_url in list_urls:
+            try:
+                links = parse_books(archive.get(list_url))
+            except KeyError:
+                if on_missing:
+                    on_missing(list_url)
+                continue
+            jobs = []
+            for link in links:
+                try:
+                    path = archive.path(GOODREADS_URL + link)
+                except KeyError:
+                    if on_missing:
+                        on_missing(GOODREADS_URL + link)
+                    continue
+                jobs.append(pool.submit(parse_archived, str(path), link, today))
+            for job in jobs:
+                yield job.result()
@@ -0,0 +1,212 @@
+"""
+Dead-letter queue for books that could not be scraped.
+
+Instead of aborting a run, a failed book (network error, unexpected page,
+missing book data) is recorded in a JSON Lines file with its URL, list, error
+and number of attempts so far. A list page that cannot be fetched is recorded
+the same way, as a "list" entry. ``retry_failed`` later scrapes only those books
+(and every book of those lists) again, appends the recovered ones to the run's
+CSV and keeps the rest queued. Entries are also dropped by ``resolve`` once a
+later run scrapes the book (or a book of the list) successfully.
+
+Usage Example:
+```python
+failed = DeadLetterQueue("data/list.failed.jsonl")
+pipeline = Pipeline(get_books, checked(scrape_book), today, on_failure=failed)
+...
+retry_failed(failed, "data/list.csv")
+```
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.save_csv import save_import
+from goodreads_miner.scraper import get_books, get_id, scrape_book
+
+
+class IncompleteBook(ValueError):
+    """Raised for a book page without book data, e.g. a changed layout or an error page."""
+
+
+def checked(scrape: Callable[[str, str], dict]) -> Callable[[str, str], dict]:
+    """
+    Wraps ``scrape`` so that books scraped without any book data raise ``IncompleteBook``.
+
+    Books are checked by their "Title", so books projected without it are not checked.
+    """
+
+    def scrape_checked(link: str, today: str) -> dict:
+        book = scrape(link, today)
+        if "Title" in book and book["Title"] is None:
+            raise IncompleteBook(f"No book data found on {link}")
+        return book
+
+    return scrape_checked
+
+
+class DeadLetterQueue:
+    """
+    Append-only JSON Lines file of failed books and lists; the last line of a URL wins.
+
+    Instances are ``Pipeline`` ``on_failure`` callbacks, and ``scraped`` is meant to be
+    called from ``on_book``. The file is only created when the first failure is recorded.
+
+    Parameters:
+    - path (str | Path): The dead-letter file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.count = 0
+        self._attempts = {entry["url"]: entry["attempts"] for entry in self.entries()}
+        self._scraped_lists: set[str] = set()
+        self._scraped_ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, list_url: str, link: str | None, error: Exception) -> None:
+        self.record(list_url, link, error)
+
+    def record(self, list_url: str, link: str | None, error: Exception) -> None:
+        """
+        Appends a failure of ``link``, counting the attempts made on it across runs.
+
+        Without a ``link``, the list page itself failed and ``list_url`` is recorded.
+        """
+        url, kind = (list_url, "list") if link is None else (link, "book")
+        with self._lock:
+            attempts = self._attempts.get(url, 0) + 1
+            self._attempts[url] = attempts
+            entry = {
+                "url": url,
+                "kind": kind,
+                "list": list_url,
+                "error": f"{type(error).__name__}: {error}",
+                "attempts": attempts,
+                "failed": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf8") as file:
+                file.write(json.dumps(entry) + "\n")
+            self.count += 1
+
+    def entries(self) -> list[dict]:
+        """Returns the latest entry of every queued URL, in order of first failure."""
+        if not self.path.exists():
+            return []
+        latest: dict[str, dict] = {}
+        with open(self.path, encoding="utf8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    latest[entry["url"]] = entry
+        return list(latest.values())
+
+    def keep(self, urls: set[str]) -> None:
+        """Rewrites the file with only the entries of ``urls``, removing it when none is left."""
+        with self._lock:
+            entries = [entry for entry in self.entries() if entry["url"] in urls]
+            if not entries:
+                self.path.unlink(missing_ok=True)
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf8") as file:
+                for entry in entries:
+                    file.write(json.dumps(entry) + "\n")
+            os.replace(tmp, self.path)
+
+    def scraped(self, list_url: str, book: dict) -> None:
+        """Notes a book scraped successfully, see ``resolve``."""
+        with self._lock:
+            self._scraped_lists.add(list_url)
+            if book.get("Book Id"):
+                self._scraped_ids.add(str(book["Book Id"]))
+
+    def resolve(self) -> int:
+        """
+        Drops the entries of books since passed to ``scraped``, and of lists one of
+        whose books was, so that ``retry_failed`` does not add them a second time.
+
+        Returns:
+        - int: Number of entries dropped.
+        """
+        entries = self.entries()
+        with self._lock:
+            pending = {
+                entry["url"]
+                for entry in entries
+                if not (
+                    entry["url"] in self._scraped_lists
+                    if entry.get("kind") == "list"
+                    else get_id(entry["url"]) in self._scraped_ids
+                )
+            }
+        if len(pending) < len(entries):
+            self.keep(pending)
+        return len(entries) - len(pending)
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+
+def retry_failed(
+    queue: DeadLetterQueue,
+    output: str | Path,
+    scrape: Callable[[str, str], dict] | None = None,
+    bookshelf: str = "imported by Goodreads miner",
+    workers: int = 4,
+    progress=None,
+    fetch_list: Callable[[str], list[str]] | None = None,
+) -> tuple[int, int]:
+    """
+    Scrapes the queued books again and appends the recovered ones to ``output``.
+
+    Failed lists are fetched again with ``fetch_list`` (default ``get_books``) and
+    all their books scraped. Books and lists failing again stay in the queue with
+    one more attempt.
+
+    Returns:
+    - tuple[int, int]: Number of recovered books and of books and lists still failing.
+    """
+    entries = queue.entries()
+    if not entries:
+        return 0, 0
+    links: dict[str, list[str]] = {}
+    lists: set[str] = set()
+    for entry in entries:
+        if entry.get("kind") == "list":
+            lists.add(entry["url"])
+            links.setdefault(entry["url"], [])
+        else:
+            links.setdefault(entry["list"], []).append(entry["url"])
+    failing: set[str] = set()
+
+    def on_failure(list_url: str, link: str | None, error: Exception) -> None:
+        failing.add(list_url if link is None else link)
+        queue.record(list_url, link, error)
+
+    def fetch_links(list_url: str) -> list[str]:
+        if list_url in lists:
+            # Every book of the list, the queued ones included
+            return (fetch_list or get_books)(list_url)
+        return links[list_url]
+
+    pipeline = Pipeline(
+        fetch_links,
+        checked(scrape or scrape_book),
+        str(date.today()),
+        book_workers=workers,
+        on_failure=on_failure,
+        progress=progress,
+    )
+    books = list(pipeline.run(list(links)))
+    if books:
+        output = Path(output)
+        save_import(books, output.name, bookshelf=bookshelf, output_dir=str(output.parent), append=True)
+    queue.keep(failing)
+    return len(books), len(failing)
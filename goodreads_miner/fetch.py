@@ -0,0 +1,352 @@
+"""
+HTTP fetch layer shared by the scraper.
+
+``Fetcher`` downloads a page and reports every request (size, duration and
+error) to its observers, e.g. a ``goodreads_miner.progress.Progress``. When
+given a ``goodreads_miner.archive.Archive`` it also stores every page body.
+
+For long-running processes a ``Fetcher`` can also keep state warm between
+requests:
+
+- ``ConnectionPool`` reuses keep-alive HTTP(S) connections per host,
+- ``ResponseCache`` keeps recently fetched bodies in memory for a while.
+
+When tracing is on (see ``goodreads_miner.tracing``), requests are split into
+DNS lookup, TCP connect, TLS handshake, request, wait for the first byte and
+body download spans. Without a pool they still go through urllib's opener, with
+its proxy settings, redirects and error handling; only its connections are
+replaced by traced ones.
+
+Usage Example:
+```python
+from goodreads_miner import scraper
+from goodreads_miner.fetch import Fetcher
+
+scraper.set_fetcher(Fetcher(observers=[progress.record_fetch]))
+```
+"""
+
+import http.client
+import socket
+import ssl
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import HTTPHandler, HTTPSHandler, OpenerDirector, build_opener, urlopen
+
+from goodreads_miner import tracing
+from goodreads_miner.tracing import span
+
+# Called with (url, number of bytes, seconds, exception or None)
+Observer = Callable[[str, int, float, BaseException | None], None]
+
+# Same User-Agent as urllib, so pooled requests look like the urlopen ones
+USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+def traced_connection(
+    address: tuple[str, int],
+    timeout: float | object = socket._GLOBAL_DEFAULT_TIMEOUT,
+    source_address: tuple[str, int] | None = None,
+) -> socket.socket:
+    """``socket.create_connection`` with the DNS lookup and the TCP connect as separate spans."""
+    host, port = address
+    with span("dns", host=host):
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    with span("connect") as trace:
+        for family, kind, proto, _, sockaddr in addresses:
+            sock = socket.socket(family, kind, proto)
+            try:
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+            except OSError:
+                sock.close()
+                if sockaddr == addresses[-1][4]:
+                    raise
+                continue
+            trace["address"] = sockaddr[0]
+            return sock
+    raise OSError(f"getaddrinfo returned no address for {host}")
+
+
+class _TracedConnection:
+    """Gives the connect, request and wait for the first byte of a urllib connection their own spans."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = traced_connection
+
+    def request(self, *args, **kwargs) -> None:
+        if self.sock is None:
+            self.connect()
+        with span("request"):
+            super().request(*args, **kwargs)
+
+    def getresponse(self) -> http.client.HTTPResponse:
+        with span("wait"):
+            return super().getresponse()
+
+
+class TracedHTTPConnection(_TracedConnection, http.client.HTTPConnection):
+    pass
+
+
+class TracedHTTPSConnection(_TracedConnection, http.client.HTTPSConnection):
+    def connect(self) -> None:
+        http.client.HTTPConnection.connect(self)
+        with span("tls"):
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=self._tunnel_host or self.host)
+
+
+class TracedHTTPHandler(HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(TracedHTTPConnection, req)
+
+
+class TracedHTTPSHandler(HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(TracedHTTPSConnection, req, context=self._context)
+
+
+_traced_opener: OpenerDirector | None = None
+
+
+def traced_opener() -> OpenerDirector:
+    """The ``urlopen`` opener with traced connections; proxies, redirects and errors are handled the same."""
+    global _traced_opener
+    if _traced_opener is None:
+        _traced_opener = build_opener(TracedHTTPHandler, TracedHTTPSHandler)
+    return _traced_opener
+
+
+class ConnectionPool:
+    """
+    Keeps idle keep-alive connections per (scheme, host) for reuse.
+
+    Responses follow redirects, and HTTP errors raise ``urllib.error.HTTPError``
+    like ``urlopen`` does.
+
+    Parameters:
+    - timeout (float): Socket timeout in seconds.
+    - max_idle (int): Maximum number of idle connections kept per host.
+    - max_redirects (int): Maximum number of redirects followed per request.
+    """
+
+    def __init__(self, timeout: float = 30, max_idle: int = 8, max_redirects: int = 5):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_redirects = max_redirects
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._ssl_context: ssl.SSLContext | None = None
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme: str, host: str) -> tuple[http.client.HTTPConnection, bool]:
+        """Returns an idle connection to ``host`` if any, or a new one, and whether it was reused."""
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                return idle.pop(), True
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, timeout=self.timeout), False
+
+    def _release(self, scheme: str, host: str, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _connect(self, connection: http.client.HTTPConnection) -> None:
+        """Opens a new connection step by step, so that each step gets its own trace span."""
+        sock = traced_connection((connection.host, connection.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if isinstance(connection, http.client.HTTPSConnection):
+            with span("tls"):
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+                    self._ssl_context.set_alpn_protocols(["http/1.1"])
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=connection.host)
+        connection.sock = sock
+
+    def _get(self, url: str) -> tuple[http.client.HTTPResponse, bytes]:
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        while True:
+            connection, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                if not reused and tracing.enabled():
+                    self._connect(connection)
+                with span("request", reused=reused):
+                    connection.request("GET", path, headers={"User-Agent": USER_AGENT, "Host": parts.netloc})
+                with span("wait"):
+                    response = connection.getresponse()
+                with span("body") as trace:
+                    body = response.read()
+                    trace["bytes"] = len(body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused:
+                    # The server closed an idle connection: retry once on a fresh one
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(parts.scheme, parts.netloc, connection)
+            return response, body
+
+    def request(self, url: str) -> bytes:
+        """Downloads ``url`` over a pooled connection and returns the response body."""
+        for _ in range(self.max_redirects + 1):
+            response, body = self._get(url)
+            location = response.getheader("Location")
+            if response.status in REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            return body
+        raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+    def close(self) -> None:
+        """Closes all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of page bodies with a time to live.
+
+    Parameters:
+    - max_entries (int): Maximum number of bodies kept.
+    - ttl (float): Seconds a body stays valid.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(url, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, url: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[url] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Fetcher:
+    """
+    Downloads pages and notifies observers of each request.
+
+    Parameters:
+    - observers (Iterable[Observer]): Callbacks notified after every request.
+    - timeout (float): Socket timeout in seconds.
+    - archive (Archive | None): Where to store the raw body of every fetched page.
+    - pool (ConnectionPool | None): Reuse keep-alive connections instead of ``urlopen``.
+    - cache (ResponseCache | None): Serve recently fetched pages from memory.
+    - limiter (AdaptiveLimiter | None): Bounds and adapts the number of requests in flight.
+    - proxies (ProxyPool | None): Send requests through a pool of egress proxies.
+    - hedger (Hedger | None): Send a backup request when a response is unusually slow.
+    """
+
+    def __init__(
+        self,
+        observers: Iterable[Observer] = (),
+        timeout: float = 30,
+        archive=None,
+        pool: ConnectionPool | None = None,
+        cache: ResponseCache | None = None,
+        limiter=None,
+        proxies=None,
+        hedger=None,
+    ):
+        self.observers = list(observers)
+        self.timeout = timeout
+        self.archive = archive
+        self.pool = pool
+        self.cache = cache
+        self.limiter = limiter
+        self.proxies = proxies
+        self.hedger = hedger
+
+    def __call__(self, url: str) -> bytes:
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                return body
+        started = time.monotonic()
+        try:
+            if self.limiter is not None:
+                with self.limiter.slot(), span("download"):
+                    body = self.hedged_download(url)
+            else:
+                with span("download"):
+                    body = self.hedged_download(url)
+        except Exception as exc:
+            self.notify(url, 0, time.monotonic() - started, exc)
+            raise
+        self.notify(url, len(body), time.monotonic() - started, None)
+        if self.archive is not None:
+            self.archive.put(url, body)
+        if self.cache is not None:
+            self.cache.put(url, body)
+        return body
+
+    def hedged_download(self, url: str) -> bytes:
+        """Downloads ``url``, through the hedger when there is one."""
+        if self.hedger is not None:
+            return self.hedger.run(self.download, url)
+        return self.download(url)
+
+    def download(self, url: str) -> bytes:
+        """Performs the actual request and returns the response body."""
+        if self.proxies is not None:
+            return self.proxies.download(url, self.timeout)
+        if self.pool is not None:
+            return self.pool.request(url)
+        open_url = traced_opener().open if tracing.enabled() else urlopen
+        with open_url(url, timeout=self.timeout) as response:
+            with span("body") as trace:
+                body = response.read()
+                trace["bytes"] = len(body)
+            return body
+
+    def notify(self, url: str, size: int, seconds: float, error: BaseException | None) -> None:
+        for observer in self.observers:
+            observer(url, size, seconds, error)
@@ -0,0 +1,117 @@
+"""
+Hedged requests against tail latency.
+
+``Hedger`` runs each download in a small thread pool. When a response has not
+arrived after the ``percentile`` latency observed so far, it sends a second,
+identical request and returns whichever succeeds first; the slower one is left
+to finish in the background and its result is dropped.
+
+Hedges are capped: at most ``budget`` extra requests per request sent (e.g.
+0.05 is 5% extra load), however slow the server gets. The counters ``hedges``
+(fired), ``wins`` (the hedge answered first) and ``denied`` (over budget) tell
+how often hedging helped.
+
+Usage Example:
+```python
+hedger = Hedger(percentile=95, budget=0.05)
+scraper.set_fetcher(Fetcher(hedger=hedger))
+```
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+
+class Hedger:
+    """
+    Sends a backup request when a response is slower than usual.
+
+    Parameters:
+    - percentile (float): Latency percentile after which a hedge is sent.
+    - budget (float): Maximum number of hedges per request sent, e.g. 0.05.
+    - min_samples (int): Responses observed before hedging starts.
+    - window (int): Number of recent latencies the percentile is computed on.
+    - max_workers (int): Threads running requests, primaries and hedges together.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+        max_workers: int = 32,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError(f"Invalid hedging percentile: {percentile} (expected between 0 and 100)")
+        if budget < 0:
+            raise ValueError(f"Invalid hedging budget: {budget}")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self.denied = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+
+    def delay(self) -> float | None:
+        """Seconds after which a request gets hedged, or None while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def _record(self, started: float, future: Future) -> None:
+        # Latencies of primaries only, hedged or not, so hedging does not skew the percentile
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 <= self.budget * self.requests:
+                self.hedges += 1
+                return True
+            self.denied += 1
+            return False
+
+    def run(self, download: Callable[[str], bytes], url: str) -> bytes:
+        """
+        Downloads ``url`` with ``download``, hedging it if it is slow.
+
+        Raises the error of the first request when no request succeeds.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        started = time.monotonic()
+        primary = self._executor.submit(download, url)
+        primary.add_done_callback(lambda future: self._record(started, future))
+        pending = {primary}
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and self._allow():
+                pending.add(self._executor.submit(download, url))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        with self._lock:
+                            self.wins += 1
+                    return future.result()
+        return primary.result()
+
+    def summary(self) -> str:
+        return f"{self.hedges} hedged requests ({self.wins} won, {self.denied} over budget) of {self.requests}"
+
+    def close(self) -> None:
+        """Stops accepting requests; requests still running finish in the background."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,78 @@
+"""
+Index of the books already in a user's Goodreads library.
+
+``LibraryIndex`` loads a Goodreads library export CSV (the same columns as
+``save_import`` writes) into sets of Book Ids and ISBNs, so the pipeline can
+skip books the user already has: by Book Id before their page is fetched, and
+by ISBN once it has been parsed.
+
+Usage Example:
+```python
+library = LibraryIndex.load("goodreads_library_export.csv")
+library.has_link("/book/show/12345.Some_Title")
+```
+"""
+
+import csv
+
+from goodreads_miner.scraper import get_id
+
+
+def clean_isbn(value: str | None) -> str:
+    """
+    Normalizes an ISBN cell of a Goodreads CSV.
+
+    Examples:
+    - '="9781234567897"' -> "9781234567897"
+    - '=""' -> ""
+    - '="None"' -> ""
+    """
+    if not value:
+        return ""
+    value = value.strip().lstrip("=").strip('"')
+    return "" if value == "None" else value
+
+
+class LibraryIndex:
+    """
+    Book Ids and ISBNs of a Goodreads library.
+
+    Parameters:
+    - book_ids (set[str]): Goodreads Book Ids.
+    - isbns (set[str]): ISBN-10 and ISBN-13 values.
+    """
+
+    def __init__(self, book_ids: set[str] | None = None, isbns: set[str] | None = None):
+        self.book_ids = book_ids or set()
+        self.isbns = isbns or set()
+
+    @classmethod
+    def load(cls, filename: str) -> "LibraryIndex":
+        """Builds the index from a Goodreads library export CSV."""
+        index = cls()
+        with open(filename, newline="", encoding="utf8") as csvfile:
+            for row in csv.DictReader(csvfile):
+                if row.get("Book Id"):
+                    index.book_ids.add(row["Book Id"].strip())
+                for field in ("ISBN", "ISBN13"):
+                    isbn = clean_isbn(row.get(field))
+                    if isbn:
+                        index.isbns.add(isbn)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.book_ids)
+
+    def has_link(self, book_url: str) -> bool:
+        """Whether the book behind a list link (e.g. "/book/show/123.Title") is in the library."""
+        return get_id(book_url) in self.book_ids
+
+    def has_book(self, book: dict) -> bool:
+        """Whether a scraped book is in the library, by Book Id or ISBN."""
+        if book.get("Book Id") in self.book_ids:
+            return True
+        for field in ("ISBN", "ISBN13"):
+            isbn = clean_isbn(book.get(field))
+            if isbn and isbn in self.isbns:
+                return True
+        return False
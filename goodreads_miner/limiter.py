@@ -0,0 +1,115 @@
+"""
+Adaptive concurrency limit (AIMD) for requests to Goodreads.
+
+``AdaptiveLimiter`` bounds the number of requests in flight. The limit grows
+additively (about ``increase`` per round trip) while responses are healthy, and
+is cut multiplicatively by ``decrease`` on throttling (HTTP 429), server errors
+(5xx), connection failures or latency spikes, never leaving [floor, ceiling].
+
+Usage Example:
+```python
+limiter = AdaptiveLimiter(floor=2, ceiling=32)
+with limiter.slot():
+    body = download(url)
+```
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.error import HTTPError, URLError
+
+from goodreads_miner.tracing import span
+
+
+def is_overload(error: BaseException | None) -> bool:
+    """Whether a request error means the server wants us to slow down."""
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (URLError, TimeoutError, ConnectionError))
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent requests.
+
+    Parameters:
+    - floor (int): Minimum limit.
+    - ceiling (int): Maximum limit.
+    - initial (int | None): Starting limit. Default is ``floor``.
+    - increase (float): Limit added per round trip of healthy responses.
+    - decrease (float): Factor applied to the limit on overload.
+    - spike (float): A response slower than ``spike`` times the baseline latency counts as overload.
+    """
+
+    def __init__(
+        self,
+        floor: int = 1,
+        ceiling: int = 16,
+        initial: int | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        spike: float = 3.0,
+    ):
+        if not 1 <= floor <= ceiling:
+            raise ValueError(f"Invalid limiter bounds: floor={floor}, ceiling={ceiling}")
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = float(min(max(initial or floor, floor), ceiling))
+        self.increase = increase
+        self.decrease = decrease
+        self.spike = spike
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self.backoffs = 0
+        self._last_backoff = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def current(self) -> int:
+        """The current in-flight limit, as a whole number of requests."""
+        return int(self.limit)
+
+    def acquire(self) -> None:
+        """Blocks until a request may start."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, seconds: float, error: BaseException | None = None) -> None:
+        """Records the outcome of a finished request and adjusts the limit."""
+        with self._condition:
+            self.in_flight -= 1
+            spiked = error is None and self.baseline is not None and seconds > self.spike * self.baseline
+            if is_overload(error) or spiked:
+                self._backoff()
+            elif error is None:
+                self.limit = min(float(self.ceiling), self.limit + self.increase / self.limit)
+            if error is None:
+                # Slow drift of the baseline follows lasting latency changes
+                self.baseline = seconds if self.baseline is None else 0.9 * self.baseline + 0.1 * seconds
+            self._condition.notify_all()
+
+    def _backoff(self) -> None:
+        # Requests of the same window fail together: back off once per round trip
+        now = time.monotonic()
+        if now - self._last_backoff < (self.baseline or 1.0):
+            return
+        self._last_backoff = now
+        self.backoffs += 1
+        self.limit = max(float(self.floor), self.limit * self.decrease)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Wraps one request: waits for a free slot, then records its latency and error."""
+        with span("limiter wait", limit=self.current):
+            self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as exc:
+            self.release(time.monotonic() - started, exc)
+            raise
+        self.release(time.monotonic() - started)
@@ -1,90 +1,518 @@
+import json
+import math
 import sys
-from datetime import date
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Iterable, Iterator
 from goodreads_miner import scrape_book, get_books, save_import
+from goodreads_miner import scraper
+from goodreads_miner.archive import Archive, reparse
+from goodreads_miner.deadletter import DeadLetterQueue, checked, retry_failed
+from goodreads_miner.fetch import Fetcher
+from goodreads_miner.hedging import Hedger
+from goodreads_miner.library import LibraryIndex
+from goodreads_miner.limiter import AdaptiveLimiter
+from goodreads_miner.memprofile import MemoryProfiler
+from goodreads_miner.merge import merge_imports
+from goodreads_miner.pipeline import Pipeline, read_list_urls
+from goodreads_miner.progress import Progress
+from goodreads_miner.projection import book_stages, parse_fields
+from goodreads_miner.proxies import ProxyPool
+from goodreads_miner.search import SearchIndex
+from goodreads_miner.service import serve
+from goodreads_miner.stats import compute_stats, format_stats, load_columns, save_columns
+from goodreads_miner.tracing import Tracer, set_tracer
+from goodreads_miner.watch import ListWatcher, watch
 
 
 def main() -> None:
     """
     Main entry point for the script.
 
+    Commands:
+    - (none): Scrape the lists given by --url or --file.
+    - reparse: Rebuild the CSV of --url or --file from --archive, without network access.
+    - merge <a.csv> <b.csv> ...: Combine import CSVs into --output, one row per "Book Id".
+    - serve: Run a local HTTP API for scraping jobs, see ``goodreads_miner.service``.
+    - index <a.csv> <b.csv> ...: Add the books of import CSVs to the --index search index.
+    - search <terms>: Search the --index index, e.g. search author:guin earth* (prefix).
+    - stats <a.csv> [b.npz] ...: Summarize ratings, page counts, publication years and authors (needs NumPy).
+    - retry-failed: Scrape the books of --url or --file that failed again and append them to its CSV.
+    - watch: Poll --url or --file every --interval seconds and append only newly added books to --output.
+
     Command line arguments:
     - --url <goodreads_list_url>: Process a Goodreads list URL.
     - --file <file_with_goodreads_lists_urls>: Process a file containing Goodreads list URLs.
     - --bookshelf <shelf_name>: Specify the Goodreads bookshelf for import metadata (optional, default: "to-read")
     - --output_dir <path>: Directory where the CSV file will be saved (optional, default: current directory)
+    - --workers <n>: Number of concurrent book scrapers (optional, default: 4)
+    - --min-workers <n> / --max-workers <n>: Adapt the number of requests in flight between
+      these bounds from observed latency and errors (AIMD); --workers is the starting point (optional)
+    - --max-runtime <seconds>: Time budget for --file runs; partial results are saved (optional)
+    - --deadline <time>: Wall-clock end of the budget, e.g. "06:30" or "2025-11-02T06:30";
+      a time already past today means tomorrow (optional)
+    - --quiet: Do not print progress (optional)
+    - --memory-profile: Report peak memory and top allocation sites per stage (optional)
+    - --trace <file>: Write timed spans of every fetch, parse and CSV write phase to a Chrome trace file (optional)
+    - --library <export.csv>: Skip books already in this Goodreads library export (optional)
+    - --hedge <percentile>: Send a second request when a response is slower than this
+      latency percentile, e.g. 95; the first answer wins (optional)
+    - --hedge-budget <ratio>: Maximum extra requests sent as hedges, e.g. 0.05 for 5% (optional, default: 0.05)
+    - --proxies <file>: Send requests through the HTTP(S) proxies listed in this file, one per line (optional)
+    - --proxy-strategy <name>: round-robin or least-loaded (optional, default: round-robin)
+    - --proxy-rate <n>: Maximum requests per second through each proxy (optional)
+    - --archive <dir>: Store every fetched page in a compressed archive, or read from it for reparse (optional)
+    - --output <file>: Merged CSV for merge (optional, default: "merged.csv" in --output_dir)
+    - --keep <rule>: Duplicate kept by merge: newest, oldest, first or last (optional, default: newest)
+    - --chunk-size <n>: Rows merge sorts in memory at once (optional, default: 100000)
+    - --host <host> / --port <port>: Address of the serve API (optional, default: 127.0.0.1:8080)
+    - --jobs <n>: Number of jobs run concurrently by serve (optional, default: 2)
+    - --interval <seconds>: Time between two polls of watch (optional, default: 3600)
+    - --polls <n>: Stop watch after this many polls (optional, default: run until interrupted)
+    - --state <file>: Watch state file (optional, default: "<name>.watch.json" in --output_dir)
+    - --index <file>: Search index updated with every scraped book (optional; default for
+      index and search: "books.index" in --output_dir)
+    - --limit <n>: Scrape only the first n books of the run; for search, the maximum
+      number of results (optional, default: all books, 20 results)
+    - --sample <n>: Scrape n books picked at random from each list (optional)
+    - --seed <n>: Seed of --sample, to pick the same books again (optional)
+    - --per-list <n>: Scrape only the first n books of each list (optional)
+    - --fields <names>: Comma-separated CSV columns to scrape, e.g. "Book Id,ISBN13"; the others
+      are left blank, and book pages are not fetched for "Book Id" and "Title" alone (optional)
+    - --top <n>: Number of authors listed by stats (optional, default: 10)
+    - --json: Print the stats as JSON (optional)
+    - --save <file.npz>: Also store the loaded stats columns, which reload much faster than CSV (optional)
+    - --failed <file>: Dead-letter file of books that failed (optional, default: "<name>.failed.jsonl" in --output_dir)
 
     Example:
         python main.py --url https://www.goodreads.com/list/show/12345.My_Favorite_Books --bookshelf read --output_dir exports
     """
     args = parse_args(sys.argv[1:])  # expects a dict or Namespace
+    if args.get("command"):
+        COMMANDS[args["command"]](args)
+        return
+
+    # Prepare output directory
+    output_dir = Path(args.get("output_dir", "."))
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Determine data and filename
+    skipped = None
+    workers = int(args.get("workers", 4))
+    try:
+        fields = parse_fields(args["fields"]) if args.get("fields") else None
+    except ValueError as exc:
+        sys.exit(str(exc))
+    progress = Progress(quiet=args.get("quiet", False))
+    library = LibraryIndex.load(args["library"]) if args.get("library") else None
+    limiter = get_limiter(args)
+    if limiter is not None:
+        progress.add_metric("limit", lambda: limiter.current)
+        workers = limiter.ceiling
+    proxies = get_proxy_pool(args)
+    if proxies is not None:
+        progress.add_metric("proxies", lambda: proxies.healthy_count)
+    hedger = get_hedger(args, workers)
+    if hedger is not None:
+        progress.add_metric("hedges", lambda: f"{hedger.wins}/{hedger.hedges}")
+    index = SearchIndex(args["index"]) if args.get("index") else None
+
+    def on_book(list_url: str, book: dict) -> None:
+        # Books scraped now resolve their dead-letter entries of earlier runs
+        failed.scraped(list_url, book)
+        if index is not None:
+            index(list_url, book)
+
+    def save(books: Iterable[dict]) -> None:
+        # Books are written as they are scraped, so an interrupted run leaves a partial CSV.
+        # Profiled stages run one at a time: the CSV write then waits for every book.
+        if profiler is None:
+            save_import(books, str(save_path), bookshelf=args.get("bookshelf", "to-read"))
+            return
+        books = list(books)
+        with profiler.stage("CSV write"):
+            save_import(books, str(save_path), bookshelf=args.get("bookshelf", "to-read"))
+
+    profiler = MemoryProfiler() if args.get("memory_profile") else None
+    if profiler is not None:
+        profiler.start()
+    tracer = Tracer(args["trace"]) if args.get("trace") else None
+    set_tracer(tracer)
     if args.get("url"):
-        data = process_url(args["url"])
-        filename = f"{get_list_name(args['url'])}.csv"
+        stem = get_list_name(args["url"])
+        failed = DeadLetterQueue(args.get("failed") or output_dir / f"{stem}.failed.jsonl")
+        progress.lists_total = 1
+        save_path = output_dir / f"{stem}.csv"
+        with fetching(progress, args.get("archive"), limiter, proxies, hedger):
+            save(process_url(
+                args["url"],
+                workers=workers,
+                on_failure=failed,
+                on_book=on_book,
+                progress=progress,
+                library=library,
+                profiler=profiler,
+                fields=fields,
+                **get_selection(args),
+            ))
     elif args.get("file"):
-        data = process_file(args["file"])
-        filename = f"{Path(args['file']).stem}.csv"
+        stem = Path(args["file"]).stem
+        failed = DeadLetterQueue(args.get("failed") or output_dir / f"{stem}.failed.jsonl")
+        deadline = get_deadline(args)
+        if deadline is not None:
+            skipped = SkipLog(output_dir / f"{stem}.skipped.txt")
+        save_path = output_dir / f"{stem}.csv"
+        with fetching(progress, args.get("archive"), limiter, proxies, hedger):
+            save(process_file(
+                args["file"],
+                workers=workers,
+                deadline=deadline,
+                on_skip=skipped,
+                on_failure=failed,
+                on_book=on_book,
+                progress=progress,
+                library=library,
+                profiler=profiler,
+                fields=fields,
+                **get_selection(args),
+            ))
     else:
         sys.exit("Invalid usage.\nUse --url <url> or --file <file>.")
+    progress.finish()
+    if hedger is not None:
+        hedger.close()
+        if not progress.quiet:
+            print(f"Hedging: {hedger.summary()}", file=sys.stderr)
+    if profiler is not None:
+        print(profiler.report(), file=sys.stderr)
+        profiler.stop()
+    if index is not None:
+        index.close()
+    if tracer is not None:
+        set_tracer(None)
+        tracer.close()
+        print(f"Trace with {tracer.spans} spans written to {tracer.path}", file=sys.stderr)
+
+    if skipped is not None:
+        skipped.close()
+    if skipped is not None and skipped.count:
+        print(f"Time budget exhausted: {skipped.count} list(s) not completed, see {skipped.path}")
+    failed.resolve()
+    if failed.count:
+        print(f"{failed.count} book(s) or list(s) failed, see {failed.path}; scrape them again with retry-failed")
 
-    # Prepare output directory
-    output_dir = Path(args.get("output_dir", "."))
-    output_dir.mkdir(parents=True, exist_ok=True)
-    save_path = output_dir / filename
 
-    # Save CSV, passing bookshelf only if specified
-    save_import(data, str(save_path), bookshelf=args.get("bookshelf", "to-read"))
 
+# Command line options taking a value, mapped to their key in the parsed args
+OPTIONS = {
+    "--url": "url",
+    "--file": "file",
+    "--bookshelf": "bookshelf",
+    "--output_dir": "output_dir",
+    "--workers": "workers",
+    "--max-runtime": "max_runtime",
+    "--deadline": "deadline",
+    "--archive": "archive",
+    "--library": "library",
+    "--output": "output",
+    "--keep": "keep",
+    "--chunk-size": "chunk_size",
+    "--host": "host",
+    "--port": "port",
+    "--jobs": "jobs",
+    "--min-workers": "min_workers",
+    "--max-workers": "max_workers",
+    "--proxies": "proxies",
+    "--proxy-strategy": "proxy_strategy",
+    "--proxy-rate": "proxy_rate",
+    "--interval": "interval",
+    "--polls": "polls",
+    "--state": "state",
+    "--trace": "trace",
+    "--failed": "failed",
+    "--top": "top",
+    "--index": "index",
+    "--hedge": "hedge",
+    "--hedge-budget": "hedge_budget",
+    "--limit": "limit",
+    "--save": "save",
+    "--sample": "sample",
+    "--seed": "seed",
+    "--per-list": "per_list",
+    "--fields": "fields",
+}
+
+# Command line switches without a value, mapped to their key in the parsed args
+FLAGS = {
+    "--quiet": "quiet",
+    "--memory-profile": "memory_profile",
+    "--json": "json",
+}
 
 
 def parse_args(argv):
     args = {"bookshelf": "imported by Goodread miner", "output_dir": "."}
+    if argv and not argv[0].startswith("--"):
+        if argv[0] not in COMMANDS:
+            sys.exit(f"Unknown command: {argv[0]}")
+        args["command"] = argv[0]
+        argv = argv[1:]
     i = 0
     while i < len(argv):
+        if "command" in args and not argv[i].startswith("--"):
+            args.setdefault("inputs", []).append(argv[i])
+            i += 1
+            continue
+        if argv[i] in FLAGS:
+            args[FLAGS[argv[i]]] = True
+            i += 1
+            continue
         if i + 1 >= len(argv):
             sys.exit(f"Missing value for argument: {argv[i]}")
-        if argv[i] == "--url":
-            args["url"] = argv[i + 1]
-        elif argv[i] == "--file":
-            args["file"] = argv[i + 1]
-        elif argv[i] == "--bookshelf":
-            args["bookshelf"] = argv[i + 1]
-        elif argv[i] == "--output_dir":
-            args["output_dir"] = argv[i + 1]
+        if argv[i] in OPTIONS:
+            args[OPTIONS[argv[i]]] = argv[i + 1]
         else:
             sys.exit(f"Unknown argument: {argv[i]}")
         i += 2
     return args
 
 
+def get_deadline(args: dict) -> float | None:
+    """
+    Converts --max-runtime / --deadline into a ``time.monotonic()`` deadline.
+
+    When both are given the earliest one wins. A --deadline time of day already
+    past today is tomorrow's. Returns None when no budget is set.
+    """
+    budgets = []
+    if args.get("max_runtime"):
+        try:
+            seconds = float(args["max_runtime"])
+        except ValueError:
+            seconds = math.nan
+        if not math.isfinite(seconds) or seconds <= 0:
+            sys.exit(f"Invalid --max-runtime: {args['max_runtime']} (expected a positive number of seconds)")
+        budgets.append(seconds)
+    if args.get("deadline"):
+        now = datetime.now()
+        try:
+            end = datetime.fromisoformat(args["deadline"])
+        except ValueError:
+            try:
+                end = datetime.combine(now.date(), datetime.strptime(args["deadline"], "%H:%M").time())
+            except ValueError:
+                sys.exit(f"Invalid --deadline: {args['deadline']} (expected e.g. 06:30 or 2025-11-02T06:30)")
+            if end <= now:
+                end += timedelta(days=1)
+        budgets.append((end - now).total_seconds())
+    if not budgets:
+        return None
+    return time.monotonic() + min(budgets)
+
+
+def get_limiter(args: dict) -> AdaptiveLimiter | None:
+    """Builds the adaptive concurrency limiter of --min-workers / --max-workers, if requested."""
+    if not args.get("min_workers") and not args.get("max_workers"):
+        return None
+    floor = int(args.get("min_workers", 1))
+    ceiling = int(args.get("max_workers", max(floor, 16)))
+    try:
+        return AdaptiveLimiter(floor=floor, ceiling=ceiling, initial=int(args.get("workers", floor)))
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+
+def get_proxy_pool(args: dict) -> ProxyPool | None:
+    """Builds the proxy pool of --proxies, if given."""
+    if not args.get("proxies"):
+        return None
+    try:
+        return ProxyPool(
+            read_list_urls(args["proxies"]),
+            strategy=args.get("proxy_strategy", "round-robin"),
+            rate=float(args["proxy_rate"]) if args.get("proxy_rate") else None,
+        )
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+
+def get_hedger(args: dict, workers: int) -> Hedger | None:
+    """Builds the request hedger of --hedge, if given."""
+    if not args.get("hedge"):
+        return None
+    try:
+        return Hedger(
+            percentile=float(args["hedge"]),
+            budget=float(args.get("hedge_budget", 0.05)),
+            max_workers=2 * workers,
+        )
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+
+def get_selection(args: dict) -> dict:
+    """Converts --limit / --per-list / --sample / --seed into ``Pipeline`` keyword arguments."""
+    selection = {}
+    for key in ("limit", "per_list", "sample", "seed"):
+        if args.get(key):
+            try:
+                selection[key] = int(args[key])
+            except ValueError:
+                sys.exit(f"Invalid --{key.replace('_', '-')}: {args[key]}")
+            if key != "seed" and selection[key] < 1:
+                sys.exit(f"Invalid --{key.replace('_', '-')}: {args[key]} (expected at least 1)")
+    return selection
+
+
+@contextmanager
+def fetching(
+    progress: Progress,
+    archive: str | None = None,
+    limiter: AdaptiveLimiter | None = None,
+    proxies: ProxyPool | None = None,
+    hedger: Hedger | None = None,
+):
+    """
+    Routes the scraper's downloads through a ``Fetcher`` reporting to ``progress``,
+    storing every page in ``archive``, bounding requests in flight with
+    ``limiter``, sending them through ``proxies`` and hedging slow ones with
+    ``hedger`` when given.
+    """
+    scraper.set_fetcher(
+        Fetcher(
+            observers=[progress.record_fetch],
+            archive=Archive(archive) if archive else None,
+            limiter=limiter,
+            proxies=proxies,
+            hedger=hedger,
+        )
+    )
+    try:
+        yield
+    finally:
+        scraper.set_fetcher(None)
+
+
+class SkipLog:
+    """
+    Writes the list URLs skipped by a time-budgeted run to a file usable with --file.
+
+    The file is created with the first URL and kept open, buffered, until ``close``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __call__(self, list_url: str) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf8")
+            self._file.write(list_url + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+
+
+
+def process_url(
+    url: str,
+    workers: int = 4,
+    on_failure=None,
+    on_book=None,
+    progress: Progress | None = None,
+    library: LibraryIndex | None = None,
+    profiler: MemoryProfiler | None = None,
+    limit: int | None = None,
+    per_list: int | None = None,
+    sample: int | None = None,
+    seed: int | None = None,
+    fields: frozenset[str] | None = None,
+) -> Iterator[dict]:
+    """
+    Processes a Goodreads list URL and yields the book info as books are scraped.
 
-def process_url(url: str) -> list[dict]:
-    """Processes a Goodreads list URL and returns a list of book info."""
+    Books that fail are passed to ``on_failure`` if given, otherwise the first failure is raised.
+    Every scraped book is passed to ``on_book`` with its list URL, if given.
+    ``limit``, ``per_list`` and ``sample`` restrict the books scraped, see ``Pipeline``.
+    With ``fields`` only those fields are extracted, see ``goodreads_miner.projection``.
+    """
     today = date.today()
-    books_data = []
-    books_urls = get_books(url)
-    for idx, link in enumerate(books_urls, start=1):
-        print(f"Processing book {idx}/{len(books_urls)}")
-        book = scrape_book(link, str(today))
-        books_data.append(book)
-        print(f"Processed {book['Title']} successfully")
-    return books_data
-
-
-def process_file(txtfile: str) -> list[dict]:
-    """Processes a file containing multiple Goodreads list URLs."""
+    fetch_list, scrape = book_stages(fields, get_books, scrape_book)
+    pipeline = Pipeline(
+        fetch_list,
+        checked(scrape) if on_failure is not None else scrape,
+        str(today),
+        book_workers=workers,
+        on_failure=on_failure,
+        on_book=on_book,
+        progress=progress,
+        library=library,
+        profiler=profiler,
+        limit=limit,
+        per_list=per_list,
+        sample=sample,
+        seed=seed,
+    )
+    return pipeline.run([url])
+
+
+def process_file(
+    txtfile: str,
+    workers: int = 4,
+    deadline: float | None = None,
+    on_skip=None,
+    on_failure=None,
+    on_book=None,
+    progress: Progress | None = None,
+    library: LibraryIndex | None = None,
+    profiler: MemoryProfiler | None = None,
+    limit: int | None = None,
+    per_list: int | None = None,
+    sample: int | None = None,
+    seed: int | None = None,
+    fields: frozenset[str] | None = None,
+) -> Iterator[dict]:
+    """
+    Processes a file containing multiple Goodreads list URLs and yields the book info.
+
+    The file is read lazily and list fetching overlaps with book scraping,
+    see ``goodreads_miner.pipeline``. With a ``deadline`` only the books that
+    could be scraped in time are yielded and the remaining lists are passed
+    to ``on_skip``. Books found in ``library`` are left out. Books that fail are
+    passed to ``on_failure`` if given, otherwise the first failure is raised.
+    Every scraped book is passed to ``on_book`` with its list URL, if given.
+    ``limit``, ``per_list`` and ``sample`` restrict the books scraped, see ``Pipeline``.
+    With ``fields`` only those fields are extracted, see ``goodreads_miner.projection``.
+    """
     today = date.today()
-    books_data = []
-    with open(txtfile, encoding="utf8") as file:
-        links = [line.strip() for line in file if line.strip()]
-    for list_url in links:
-        books_urls = get_books(list_url)
-        for link in books_urls:
-            book = scrape_book(link, str(today))
-            books_data.append(book)
-    return books_data
+    fetch_list, scrape = book_stages(fields, get_books, scrape_book)
+    pipeline = Pipeline(
+        fetch_list,
+        checked(scrape) if on_failure is not None else scrape,
+        str(today),
+        book_workers=workers,
+        deadline=deadline,
+        on_skip=on_skip,
+        on_failure=on_failure,
+        on_book=on_book,
+        progress=progress,
+        library=library,
+        profiler=profiler,
+        limit=limit,
+        per_list=per_list,
+        sample=sample,
+        seed=seed,
+    )
+    return pipeline.run(read_list_urls(txtfile))
 
 
 def get_list_name(url: str) -> str:
@@ -98,5 +526,178 @@ def get_list_name(url: str) -> str:
     return f"{list_id} - {list_name}"
 
 
+def reparse_command(args: dict) -> None:
+    """Rebuilds the CSV of a --url or --file run from its --archive, without network access."""
+    if not args.get("archive"):
+        sys.exit("Invalid usage.\nUse reparse --archive <dir> --url <url> or --file <file>.")
+    if args.get("url"):
+        list_urls = [args["url"]]
+        filename = f"{get_list_name(args['url'])}.csv"
+    elif args.get("file"):
+        list_urls = read_list_urls(args["file"])
+        filename = f"{Path(args['file']).stem}.csv"
+    else:
+        sys.exit("Invalid usage.\nUse reparse --archive <dir> --url <url> or --file <file>.")
+
+    missing = []
+    workers = int(args["workers"]) if args.get("workers") else None
+    data = list(reparse(args["archive"], list_urls, str(date.today()), workers, on_missing=missing.append))
+    save_import(
+        data,
+        filename,
+        bookshelf=args.get("bookshelf", "to-read"),
+        output_dir=args.get("output_dir", "."),
+    )
+    if missing:
+        print(f"{len(missing)} page(s) missing from the archive, e.g. {missing[0]}")
+
+
+def merge_command(args: dict) -> None:
+    """Merges the import CSVs given as arguments into one deduplicated import CSV."""
+    if not args.get("inputs"):
+        sys.exit("Invalid usage.\nUse merge <a.csv> <b.csv> ... [--output <file>] [--keep <rule>] [--chunk-size <n>].")
+    output = Path(args["output"]) if args.get("output") else Path(args.get("output_dir", ".")) / "merged.csv"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        written = merge_imports(
+            args["inputs"],
+            str(output),
+            keep=args.get("keep", "newest"),
+            chunk_size=int(args.get("chunk_size", 100_000)),
+        )
+    except ValueError as exc:
+        sys.exit(str(exc))
+    print(f"Merged {len(args['inputs'])} file(s) into {output}: {written} books")
+
+
+def get_index_path(args: dict) -> Path:
+    return Path(args["index"]) if args.get("index") else Path(args.get("output_dir", ".")) / "books.index"
+
+
+def index_command(args: dict) -> None:
+    """Adds the books of the import CSVs given as arguments to the search index."""
+    if not args.get("inputs"):
+        sys.exit("Invalid usage.\nUse index <a.csv> <b.csv> ... [--index <file>].")
+    with SearchIndex(get_index_path(args)) as index:
+        added = sum(index.add_csv(filename) for filename in args["inputs"])
+        print(f"Indexed {added} books from {len(args['inputs'])} file(s), {len(index)} books in {index.path}")
+
+
+def search_command(args: dict) -> None:
+    """Prints the books of the search index matching the terms given as arguments."""
+    if not args.get("inputs"):
+        sys.exit("Invalid usage.\nUse search <terms> ... [--index <file>] [--limit <n>] [--json].")
+    path = get_index_path(args)
+    if not path.exists():
+        sys.exit(f"No search index at {path}, build one with --index or the index command.")
+    with SearchIndex(path) as index:
+        results = index.search(" ".join(args["inputs"]), limit=int(args.get("limit", 20)))
+    if args.get("json"):
+        print(json.dumps(results, indent=2))
+        return
+    for book in results:
+        authors = ", ".join(filter(None, (book["Author"], book["Additional Authors"])))
+        print(f"{book['Book Id']:>10}  {book['Title']} by {authors}")
+        for list_url in book["Lists"]:
+            print(f"{'':>12}{list_url}")
+    print(f"{len(results)} result(s)")
+
+
+def stats_command(args: dict) -> None:
+    """Prints summary statistics of the import CSVs (or .npz column files) given as arguments."""
+    if not args.get("inputs"):
+        sys.exit("Invalid usage.\nUse stats <a.csv> <b.csv> ... [--top <n>] [--json] [--save <file.npz>].")
+    try:
+        columns = load_columns(args["inputs"])
+    except ImportError as exc:
+        sys.exit(str(exc))
+    if args.get("save"):
+        save_columns(columns, args["save"])
+    stats = compute_stats(columns, top=int(args.get("top", 10)))
+    print(json.dumps(stats, indent=2) if args.get("json") else format_stats(stats))
+
+
+def serve_command(args: dict) -> None:
+    """Runs the scraping service until interrupted."""
+    serve(
+        host=args.get("host", "127.0.0.1"),
+        port=int(args.get("port", 8080)),
+        output_dir=args.get("output_dir", "."),
+        workers=int(args.get("workers", 4)),
+        max_jobs=int(args.get("jobs", 2)),
+    )
+
+
+def retry_failed_command(args: dict) -> None:
+    """Scrapes the books in the dead-letter file of --url or --file again and appends them to its CSV."""
+    if args.get("url"):
+        stem = get_list_name(args["url"])
+    elif args.get("file"):
+        stem = Path(args["file"]).stem
+    else:
+        sys.exit("Invalid usage.\nUse retry-failed --url <url> or --file <file> [--failed <file>].")
+    output_dir = Path(args.get("output_dir", "."))
+    failed = DeadLetterQueue(args.get("failed") or output_dir / f"{stem}.failed.jsonl")
+    output = Path(args["output"]) if args.get("output") else output_dir / f"{stem}.csv"
+    if not len(failed):
+        print(f"No failed books in {failed.path}")
+        return
+    progress = Progress(quiet=args.get("quiet", False))
+    with fetching(progress, args.get("archive"), get_limiter(args), get_proxy_pool(args)):
+        recovered, remaining = retry_failed(
+            failed,
+            output,
+            scrape=scrape_book,
+            bookshelf=args.get("bookshelf", "to-read"),
+            workers=int(args.get("workers", 4)),
+            progress=progress,
+            fetch_list=get_books,
+        )
+    progress.finish()
+    print(f"{recovered} book(s) recovered into {output}, {remaining} book(s) or list(s) still failing")
+
+
+def watch_command(args: dict) -> None:
+    """Polls the lists of --url or --file and appends the books added since the last poll to a delta CSV."""
+    if args.get("url"):
+        list_urls = [args["url"]]
+        stem = get_list_name(args["url"])
+    elif args.get("file"):
+        list_urls = list(read_list_urls(args["file"]))
+        stem = Path(args["file"]).stem
+    else:
+        sys.exit("Invalid usage.\nUse watch --url <url> or --file <file> [--interval <seconds>].")
+    output_dir = Path(args.get("output_dir", "."))
+    watcher = ListWatcher(args.get("state") or output_dir / f"{stem}.watch.json")
+    delta_path = Path(args["output"]) if args.get("output") else output_dir / f"{stem}.delta.csv"
+    progress = Progress(quiet=True)
+    try:
+        with fetching(progress, args.get("archive"), get_limiter(args), get_proxy_pool(args)):
+            watch(
+                watcher,
+                list_urls,
+                delta_path,
+                interval=float(args.get("interval", 3600)),
+                polls=int(args["polls"]) if args.get("polls") else None,
+                bookshelf=args.get("bookshelf", "to-read"),
+                workers=int(args.get("workers", 4)),
+            )
+    except KeyboardInterrupt:
+        pass
+
+
+# Subcommands, mapped to the function running them
+COMMANDS = {
+    "reparse": reparse_command,
+    "merge": merge_command,
+    "serve": serve_command,
+    "stats": stats_command,
+    "index": index_command,
+    "search": search_command,
+    "retry-failed": retry_failed_command,
+    "watch": watch_command,
+}
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+"""
+Memory profiling of the scraping stages.
+
+``MemoryProfiler`` wraps each stage call (list fetch, book parse, CSV write) with
+``tracemalloc`` and records, per stage: the number of calls, the peak memory
+allocated during a call, the memory still held after it ("retained"), the growth
+of the process peak RSS, and the top allocation sites of sampled calls.
+
+While profiling, stage calls are serialized so that every allocation can be
+attributed to exactly one stage; runs are slower but the numbers are exact.
+
+Usage Example:
+```python
+profiler = MemoryProfiler()
+profiler.start()
+with profiler.stage("book parse"):
+    scrape_book(link, today)
+print(profiler.report())
+profiler.stop()
+```
+"""
+
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss() -> int | None:
+    """Returns the peak resident set size of the process in bytes, or None if unavailable."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def format_size(size: float) -> str:
+    return f"{size / (1024 * 1024):.1f} MB" if abs(size) >= 1024 * 1024 else f"{size / 1024:.1f} KB"
+
+
+class StageStats:
+    """Memory statistics of one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.peak = 0
+        self.peak_total = 0
+        self.retained = 0
+        self.rss_growth = 0
+        self.sites: dict[str, int] = {}
+
+    @property
+    def peak_average(self) -> float:
+        return self.peak_total / self.calls if self.calls else 0.0
+
+
+class MemoryProfiler:
+    """
+    Records peak and retained memory per stage with ``tracemalloc``.
+
+    Parameters:
+    - top (int): Number of allocation sites reported per stage.
+    - sample_every (int): Take allocation snapshots on the first call of a stage
+      and then every ``sample_every`` calls (snapshots are expensive).
+    """
+
+    def __init__(self, top: int = 5, sample_every: int = 50):
+        self.top = top
+        self.sample_every = sample_every
+        self.stages: dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profiles the wrapped call as part of stage ``name``."""
+        with self._lock:
+            stats = self.stages.setdefault(name, StageStats(name))
+            sampled = stats.calls % self.sample_every == 0
+            before_snapshot = self._snapshot() if sampled else None
+            rss_before = peak_rss()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            try:
+                yield
+            finally:
+                after, peak = tracemalloc.get_traced_memory()
+                stats.calls += 1
+                stats.peak = max(stats.peak, peak - before)
+                stats.peak_total += peak - before
+                stats.retained += after - before
+                if rss_before is not None:
+                    stats.rss_growth += peak_rss() - rss_before
+                if before_snapshot is not None:
+                    self._record_sites(stats, before_snapshot)
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def _record_sites(self, stats: StageStats, before: tracemalloc.Snapshot) -> None:
+        for diff in self._snapshot().compare_to(before, "lineno")[: self.top * 4]:
+            if diff.size_diff > 0:
+                frame = diff.traceback[0]
+                site = f"{frame.filename}:{frame.lineno}"
+                stats.sites[site] = stats.sites.get(site, 0) + diff.size_diff
+
+    def report(self) -> str:
+        """Returns a human readable report of all stages."""
+        rss = peak_rss()
+        lines = [f"Memory profile (process peak RSS: {format_size(rss) if rss is not None else 'n/a'})"]
+        lines.append(f"{'stage':<12} {'calls':>7} {'avg peak':>10} {'max peak':>10} {'retained':>10} {'RSS growth':>11}")
+        for stats in self.stages.values():
+            lines.append(
+                f"{stats.name:<12} {stats.calls:>7} {format_size(stats.peak_average):>10} "
+                f"{format_size(stats.peak):>10} {format_size(stats.retained):>10} {format_size(stats.rss_growth):>11}"
+            )
+        for stats in self.stages.values():
+            if not stats.sites:
+                continue
+            lines.append(f"Top allocation sites still held after sampled '{stats.name}' calls:")
+            for site, size in sorted(stats.sites.items(), key=lambda item: -item[1])[: self.top]:
+                lines.append(f"  {format_size(size):>10}  {site}")
+        return "\n".join(lines)
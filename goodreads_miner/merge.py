@@ -0,0 +1,138 @@
+"""
+Merges many Goodreads import CSVs into one, deduplicated on "Book Id".
+
+The merge is an external sort, so memory stays bounded whatever the size of the
+inputs:
+
+1. rows are read in chunks of ``chunk_size``, each chunk is sorted by
+   "Book Id" and written to a temporary run file,
+2. the sorted runs are merged with ``heapq.merge`` (at most ``FAN_IN`` files at
+   a time), and all rows sharing a "Book Id" are reduced to the one selected by
+   the ``keep`` rule.
+
+Rows without a "Book Id" cannot be deduplicated and are all kept.
+
+Usage Example:
+```python
+merge_imports(["run1.csv", "run2.csv"], "merged.csv", keep="newest")
+```
+"""
+
+import csv
+import heapq
+import itertools
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from goodreads_miner.save_csv import DATA_FIELDS
+
+BOOK_ID = DATA_FIELDS.index("Book Id")
+DATE_ADDED = DATA_FIELDS.index("Date Added")
+
+# Maximum number of run files merged at once, to stay below open file limits
+FAN_IN = 128
+
+# Deduplication rules: how to pick the winning row among rows sharing a "Book Id".
+# Every row carries its input order as a trailing sequence number, so ties are
+# broken deterministically and the groups can be reduced without buffering them.
+KEEP_RULES = {
+    "newest": (max, lambda row: (row[DATE_ADDED], int(row[-1]))),
+    "oldest": (min, lambda row: (row[DATE_ADDED], int(row[-1]))),
+    "first": (min, lambda row: int(row[-1])),
+    "last": (max, lambda row: int(row[-1])),
+}
+
+
+def read_rows(filenames: Iterable[str]) -> Iterator[list[str]]:
+    """Yields the rows of every import CSV in ``DATA_FIELDS`` order, with a trailing sequence number."""
+    seq = itertools.count()
+    for filename in filenames:
+        with open(filename, newline="", encoding="utf8") as csvfile:
+            for row in csv.DictReader(csvfile):
+                yield [row.get(field) or "" for field in DATA_FIELDS] + [str(next(seq))]
+
+
+def sort_key(row: list[str]) -> tuple[str, int]:
+    return row[BOOK_ID], int(row[-1])
+
+
+def write_runs(rows: Iterable[list[str]], tmpdir: str, chunk_size: int) -> list[str]:
+    """Writes ``rows`` to sorted run files of at most ``chunk_size`` rows and returns their paths."""
+    runs = []
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return runs
+        chunk.sort(key=sort_key)
+        path = os.path.join(tmpdir, f"run-{len(runs)}.csv")
+        with open(path, "w", newline="", encoding="utf8") as run:
+            csv.writer(run).writerows(chunk)
+        runs.append(path)
+
+
+def merge_runs(runs: list[str], tmpdir: str) -> list[str]:
+    """Merges run files in batches of ``FAN_IN`` until at most ``FAN_IN`` remain."""
+    generation = 0
+    while len(runs) > FAN_IN:
+        merged_runs = []
+        for start in range(0, len(runs), FAN_IN):
+            path = os.path.join(tmpdir, f"merge-{generation}-{start}.csv")
+            with open_runs(runs[start:start + FAN_IN]) as rows, open(path, "w", newline="", encoding="utf8") as run:
+                csv.writer(run).writerows(rows)
+            merged_runs.append(path)
+        for path in runs:
+            os.remove(path)
+        runs = merged_runs
+        generation += 1
+    return runs
+
+
+@contextmanager
+def open_runs(runs: list[str]) -> Iterator[Iterator[list[str]]]:
+    """Opens sorted run files and yields their rows merged in "Book Id" order."""
+    files = [open(path, newline="", encoding="utf8") for path in runs]
+    try:
+        yield heapq.merge(*(csv.reader(file) for file in files), key=sort_key)
+    finally:
+        for file in files:
+            file.close()
+
+
+def merge_imports(
+    inputs: Iterable[str],
+    output: str,
+    keep: str = "newest",
+    chunk_size: int = 100_000,
+) -> int:
+    """
+    Combines import CSVs into one Goodreads import CSV with one row per "Book Id".
+
+    Parameters:
+    - inputs (Iterable[str]): Paths of the CSVs to merge.
+    - output (str): Path of the merged CSV.
+    - keep (str): Which duplicate wins: "newest" or "oldest" "Date Added", or the
+      "first" or "last" one in input order. Default is "newest".
+    - chunk_size (int): Number of rows sorted in memory at once, at least 1.
+
+    Returns:
+    - int: The number of rows written.
+    """
+    if keep not in KEEP_RULES:
+        raise ValueError(f"Unknown keep rule: {keep} (expected one of {', '.join(KEEP_RULES)})")
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size} (expected at least 1)")
+    pick, key = KEEP_RULES[keep]
+    written = 0
+    with tempfile.TemporaryDirectory() as tmpdir:
+        runs = merge_runs(write_runs(read_rows(inputs), tmpdir, chunk_size), tmpdir)
+        with open_runs(runs) as rows, open(output, "w", newline="", encoding="utf8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(DATA_FIELDS)
+            for book_id, group in itertools.groupby(rows, key=lambda row: row[BOOK_ID]):
+                for row in (group if not book_id else [pick(group, key=key)]):
+                    writer.writerow(row[:-1])
+                    written += 1
+    return written
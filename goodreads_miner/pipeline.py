@@ -0,0 +1,455 @@
+"""
+Producer/consumer pipeline for scraping many Goodreads lists.
+
+The pipeline has three stages connected by bounded queues:
+
+1. a feeder that pulls list URLs lazily from any iterable (e.g. a file),
+2. list workers that fetch each list page with ``fetch_list``,
+3. book workers that scrape every book link with ``scrape``.
+
+Books of a list start being scraped as soon as its page arrives, and the
+bounded queues provide backpressure, so memory stays constant no matter how
+many list URLs the input contains. Books are yielded in input order (lists in
+the order given, books in the order of their list), whatever order the workers
+finish them in.
+
+An optional deadline turns the run into a time-budgeted one: once the budget is
+close to running out no new fetches are started, in-flight requests are allowed
+to finish, and every list that could not be completed is reported through
+``on_skip`` so a later run can pick it up. Books of lists that were already
+fetched are preferred over fetching new lists. Once a list no longer fits, the
+feeder stops queueing lists and passes the rest of the input straight to
+``on_skip``.
+
+For previews, ``per_list`` keeps the first books of each list, ``sample`` a
+random subset of each list (reproducible with ``seed``), and ``limit`` caps the
+books of the whole run: once that many books are queued, no further list or
+book page is fetched. Books of the ``library`` are left out before they count
+towards the limit, and a book dropped once parsed gives its place back.
+
+With ``on_failure`` set, a book whose scrape raises, or a list page that cannot
+be fetched, is handed to it and the run goes on; without it the first failure
+stops the run and is re-raised.
+
+Usage Example:
+```python
+pipeline = Pipeline(get_books, scrape_book, "2025-11-01")
+for book in pipeline.run(read_list_urls("data/list.txt")):
+    print(book["Title"])
+```
+"""
+
+import queue
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Iterable, Iterator
+
+from goodreads_miner.library import LibraryIndex
+from goodreads_miner.memprofile import MemoryProfiler
+from goodreads_miner.progress import Progress
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised in a worker so it can be re-raised by the consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class _Listed:
+    """Tells the consumer how many books of the list at ``index`` were queued."""
+
+    def __init__(self, index: int, size: int):
+        self.index = index
+        self.size = size
+
+
+class _InOrder:
+    """
+    Puts the results of the book workers back in input order.
+
+    Every queued book comes back under its (list index, link index) key, as a
+    book or as None when it was skipped, failed or dropped, so the next book
+    in order is known to be ready or gone.
+    """
+
+    def __init__(self):
+        self._sizes: dict[int, int] = {}
+        self._pending: dict[tuple[int, int], dict | None] = {}
+        self._list = 0
+        self._link = 0
+
+    def listed(self, item: _Listed) -> None:
+        self._sizes[item.index] = item.size
+
+    def add(self, key: tuple[int, int], book: dict | None) -> None:
+        self._pending[key] = book
+
+    def ready(self) -> Iterator[dict]:
+        """Yields the books next in order, up to the first one still in flight."""
+        while self._list in self._sizes:
+            if self._link >= self._sizes[self._list]:
+                del self._sizes[self._list]
+                self._list, self._link = self._list + 1, 0
+                continue
+            key = (self._list, self._link)
+            if key not in self._pending:
+                return
+            book = self._pending.pop(key)
+            self._link += 1
+            if book is not None:
+                yield book
+
+    def rest(self) -> Iterator[dict]:
+        """Yields the books left once the workers are done, e.g. behind lists never fetched."""
+        for key in sorted(self._pending):
+            book = self._pending.pop(key)
+            if book is not None:
+                yield book
+
+
+def read_list_urls(txtfile: str) -> Iterator[str]:
+    """
+    Lazily yields the non-empty, stripped lines of a file of Goodreads list URLs.
+
+    Parameters:
+    - txtfile (str): Path to a file with one list URL per line.
+
+    Returns:
+    - Iterator[str]: The list URLs, read one line at a time.
+    """
+    with open(txtfile, encoding="utf8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class Pipeline:
+    """
+    Overlaps list fetching with book scraping using bounded queues.
+
+    Parameters:
+    - fetch_list (Callable): Returns the book URLs of a list URL (e.g. ``get_books``).
+    - scrape (Callable): Scrapes a book URL into a dict (e.g. ``scrape_book``).
+    - today (str): The date passed to ``scrape`` as "Date Added".
+    - list_workers (int): Number of threads fetching list pages.
+    - book_workers (int): Number of threads scraping book pages.
+    - queue_size (int): Capacity of each queue between stages.
+    - deadline (float | None): ``time.monotonic()`` value by which the run must be done.
+    - on_skip (Callable | None): Called once with each list URL that was skipped,
+      or only partially scraped, because of the deadline.
+    - on_failure (Callable | None): Called with (list URL, book link, exception) for each
+      book that could not be scraped, instead of aborting the run. The book link is None
+      for a list page that could not be fetched.
+    - on_book (Callable | None): Called with (list URL, book) for each scraped book
+      before it is yielded, e.g. to index it.
+    - progress (Progress | None): Notified of every fetched list and scraped book.
+    - library (LibraryIndex | None): Books already in the user's library, skipped
+      before they are queued (by Book Id) or dropped once parsed (by ISBN).
+    - profiler (MemoryProfiler | None): Profiles the "list fetch" and "book parse" stages.
+    - limit (int | None): Maximum number of books of the whole run, the first ones found.
+    - per_list (int | None): Maximum number of books taken from each list, its first ones.
+    - sample (int | None): Number of books picked at random from each list.
+    - seed (int | None): Seed of the random ``sample``.
+    """
+
+    def __init__(
+        self,
+        fetch_list: Callable[[str], list[str]],
+        scrape: Callable[[str, str], dict],
+        today: str,
+        list_workers: int = 1,
+        book_workers: int = 4,
+        queue_size: int = 64,
+        deadline: float | None = None,
+        on_skip: Callable[[str], None] | None = None,
+        on_failure: Callable[[str, str | None, Exception], None] | None = None,
+        on_book: Callable[[str, dict], None] | None = None,
+        progress: Progress | None = None,
+        library: LibraryIndex | None = None,
+        profiler: MemoryProfiler | None = None,
+        limit: int | None = None,
+        per_list: int | None = None,
+        sample: int | None = None,
+        seed: int | None = None,
+    ):
+        self.fetch_list = fetch_list
+        self.scrape = scrape
+        self.today = today
+        self.list_workers = max(1, list_workers)
+        self.book_workers = max(1, book_workers)
+        self.queue_size = max(1, queue_size)
+        self.deadline = deadline
+        self.on_skip = on_skip
+        self.on_failure = on_failure
+        self.on_book = on_book
+        self.progress = progress
+        self.library = library
+        self.profiler = profiler
+        self.limit = limit
+        self.per_list = per_list
+        self.sample = sample
+        self._random = random.Random(seed)
+        # Books queued towards the limit, and those of them scraped, failed or skipped for good
+        self._scheduled = 0
+        self._settled = 0
+        self._quota = threading.Condition()
+        # Running averages of stage durations, used to predict whether work fits the budget
+        self.list_seconds = 0.0
+        self.book_seconds = 0.0
+        self._out_of_time = threading.Event()
+        # Lists reported by their book workers, which can each hit the deadline
+        self._partially_skipped: set[str] = set()
+        self._skip_lock = threading.Lock()
+
+    def _fits(self, seconds: float) -> bool:
+        """Whether work expected to take ``seconds`` can finish before the deadline."""
+        return self.deadline is None or time.monotonic() + seconds < self.deadline
+
+    def _skip(self, list_url: str) -> None:
+        if self.on_skip:
+            self.on_skip(list_url)
+
+    def _skip_partial(self, list_url: str) -> None:
+        """Reports a list some of whose books were skipped, once."""
+        with self._skip_lock:
+            if list_url in self._partially_skipped:
+                return
+            self._partially_skipped.add(list_url)
+        self._skip(list_url)
+
+    def _select(self, links: list[str]) -> list[str]:
+        """The links of a list to scrape, after ``sample`` and ``per_list``."""
+        if self.sample is not None and self.sample < len(links):
+            with self._quota:
+                picked = sorted(self._random.sample(range(len(links)), self.sample))
+            links = [links[index] for index in picked]
+        if self.per_list is not None:
+            links = links[: self.per_list]
+        return links
+
+    def _quota_met(self, stop: threading.Event) -> bool:
+        """
+        Whether the run has all the books of the ``limit``.
+
+        While the limit is reached but some queued books may still be dropped,
+        waits for them to settle, as each dropped book frees a place.
+        """
+        if self.limit is None:
+            return False
+        with self._quota:
+            while self._scheduled >= self.limit:
+                if self._settled >= self._scheduled or stop.is_set():
+                    return True
+                self._quota.wait(0.1)
+            return False
+
+    def _claim(self, stop: threading.Event) -> bool:
+        """Reserves one book of the ``limit``; False once the run has all the books it needs."""
+        with self._quota:
+            if self._quota_met(stop):
+                return False
+            self._scheduled += 1
+            return True
+
+    def _settle(self, dropped: bool) -> None:
+        """Records a queued book as done with; a ``dropped`` one gives its place back."""
+        if self.limit is None:
+            return
+        with self._quota:
+            if dropped:
+                self._scheduled -= 1
+            else:
+                self._settled += 1
+            self._quota.notify_all()
+
+    def _stage(self, name: str):
+        return self.profiler.stage(name) if self.profiler is not None else nullcontext()
+
+    @staticmethod
+    def _average(current: float, sample: float) -> float:
+        return sample if current == 0.0 else 0.8 * current + 0.2 * sample
+
+    def run(self, list_urls: Iterable[str]) -> Iterator[dict]:
+        """
+        Scrapes every book of every list and yields the book dicts in input order.
+
+        The first exception raised by a stage stops the pipeline and is re-raised here.
+        Closing the generator early stops all workers.
+        """
+        stop = threading.Event()
+        list_queue: queue.Queue = queue.Queue(self.queue_size)
+        book_queue: queue.Queue = queue.Queue(self.queue_size)
+        result_queue: queue.Queue = queue.Queue(self.queue_size)
+
+        # Set once the list workers are gone, so that the feeder stops waiting on them
+        lists_closed = threading.Event()
+
+        def put(q: queue.Queue, item, closed: threading.Event | None = None) -> bool:
+            while not stop.is_set() and not (closed is not None and closed.is_set()):
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def take(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def guarded(stage: Callable[[], None]) -> Callable[[], None]:
+            def target() -> None:
+                try:
+                    stage()
+                except BaseException as exc:
+                    put(result_queue, _Failure(exc))
+                    stop.set()
+            return target
+
+        def feed() -> None:
+            urls = iter(list_urls)
+            for index, url in enumerate(urls):
+                if self._out_of_time.is_set():
+                    # Nothing more fits: report the rest of the input without queueing it
+                    self._skip(url)
+                    for url in urls:
+                        self._skip(url)
+                    break
+                if not put(list_queue, (index, url), lists_closed):
+                    return
+            for _ in range(self.list_workers):
+                put(list_queue, _DONE, lists_closed)
+
+        def fetch_lists() -> None:
+            while True:
+                item = take(list_queue)
+                if item is _DONE or self._quota_met(stop):
+                    return
+                index, url = item
+                # Books already queued get the remaining budget before new lists
+                backlog = book_queue.qsize() * self.book_seconds / self.book_workers
+                if not self._fits(self.list_seconds + backlog):
+                    self._out_of_time.set()
+                    self._skip(url)
+                    put(result_queue, _Listed(index, 0))
+                    continue
+                started = time.monotonic()
+                try:
+                    with self._stage("list fetch"):
+                        links = self._select(self.fetch_list(url))
+                except Exception as exc:
+                    if self.on_failure is None:
+                        raise
+                    self.on_failure(url, None, exc)
+                    put(result_queue, _Listed(index, 0))
+                    continue
+                self.list_seconds = self._average(self.list_seconds, time.monotonic() - started)
+                if self.progress:
+                    self.progress.list_done(len(links))
+                if self.library is not None:
+                    # Books already in the library do not count towards the limit
+                    fresh = [link for link in links if not self.library.has_link(link)]
+                    if self.progress:
+                        for _ in range(len(links) - len(fresh)):
+                            self.progress.book_skipped()
+                    links = fresh
+                queued = 0
+                for link in links:
+                    if not self._claim(stop) or not put(book_queue, ((index, queued), url, link)):
+                        break
+                    queued += 1
+                put(result_queue, _Listed(index, queued))
+                if queued < len(links):
+                    if self.progress:
+                        self.progress.books_left_out(len(links) - queued)
+                    return
+
+        def scrape_books() -> None:
+            while True:
+                item = take(book_queue)
+                if item is _DONE:
+                    return
+                key, list_url, link = item
+                if not put(result_queue, (key, scrape_one(list_url, link))):
+                    return
+
+        def scrape_one(list_url: str, link: str) -> dict | None:
+            """Scrapes one queued book; None when it is skipped, failed or dropped."""
+            dropped = False
+            try:
+                if not self._fits(self.book_seconds):
+                    self._skip_partial(list_url)
+                    return None
+                started = time.monotonic()
+                try:
+                    with self._stage("book parse"):
+                        book = self.scrape(link, self.today)
+                except Exception as exc:
+                    if self.on_failure is None:
+                        raise
+                    self.on_failure(list_url, link, exc)
+                    if self.progress:
+                        self.progress.book_failed()
+                    return None
+                self.book_seconds = self._average(self.book_seconds, time.monotonic() - started)
+                if self.library is not None and self.library.has_book(book):
+                    dropped = True
+                    if self.progress:
+                        self.progress.book_skipped()
+                    return None
+                if self.on_book is not None:
+                    self.on_book(list_url, book)
+                if self.progress:
+                    self.progress.book_done()
+                return book
+            finally:
+                self._settle(dropped)
+
+        def coordinate() -> None:
+            [feed_thread] = start(feed, 1)
+            list_threads = start(fetch_lists, self.list_workers)
+            book_threads = start(scrape_books, self.book_workers)
+            for thread in list_threads:
+                thread.join()
+            lists_closed.set()
+            # The feeder may still be passing the rest of the input to on_skip
+            feed_thread.join()
+            for _ in book_threads:
+                put(book_queue, _DONE)
+            for thread in book_threads:
+                thread.join()
+            put(result_queue, _DONE)
+
+        def start(stage: Callable[[], None], count: int) -> list[threading.Thread]:
+            threads = [threading.Thread(target=guarded(stage), daemon=True) for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            return threads
+
+        start(coordinate, 1)
+        in_order = _InOrder()
+        try:
+            while True:
+                item = result_queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.exc
+                if isinstance(item, _Listed):
+                    in_order.listed(item)
+                else:
+                    in_order.add(*item)
+                yield from in_order.ready()
+            yield from in_order.rest()
+        finally:
+            stop.set()
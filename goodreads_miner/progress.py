@@ -0,0 +1,173 @@
+"""
+Lightweight, throttled progress reporting for scraping runs.
+
+``Progress`` keeps a few counters (lists, books, bytes, errors) and prints a
+single status line at most once per ``interval`` seconds, with books/s, bytes/s
+and an ETA over all the books discovered so far. Updates are a couple of
+integer additions, so reporting stays cheap even at high concurrency.
+
+Usage Example:
+```python
+progress = Progress()
+progress.list_done(100)
+progress.book_done()
+progress.finish()
+```
+"""
+
+import sys
+import threading
+import time
+from typing import Callable
+
+
+def format_duration(seconds: float) -> str:
+    """Formats seconds as e.g. "1h02m", "3m05s" or "42s"."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def format_bytes(size: float) -> str:
+    """Formats a byte count as e.g. "512 B", "1.5 KB" or "3.2 MB"."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Progress:
+    """
+    Counts pipeline events and periodically reports rates and ETA.
+
+    Parameters:
+    - quiet (bool): Disable all output (counters are still kept).
+    - interval (float): Minimum number of seconds between two status lines.
+    - stream: Where to write the status lines. Default is ``sys.stderr``.
+    - lists_total (int | None): Number of lists in the run, if known, to extrapolate the ETA.
+    """
+
+    def __init__(self, quiet: bool = False, interval: float = 1.0, stream=None, lists_total: int | None = None):
+        self.quiet = quiet
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self.lists_total = lists_total
+        self.lists = 0
+        self.books = 0
+        self.books_total = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._next_report = self.started + interval
+        self._lock = threading.Lock()
+        self.metrics: dict[str, Callable[[], object]] = {}
+
+    def add_metric(self, name: str, read: Callable[[], object]) -> None:
+        """Adds a gauge shown in every status line, e.g. ``add_metric("limit", lambda: limiter.current)``."""
+        self.metrics[name] = read
+
+    def list_done(self, books: int) -> None:
+        """Records a fetched list page with ``books`` book links."""
+        with self._lock:
+            self.lists += 1
+            self.books_total += books
+        self.tick()
+
+    def book_done(self) -> None:
+        """Records a scraped book."""
+        with self._lock:
+            self.books += 1
+        self.tick()
+
+    def book_skipped(self) -> None:
+        """Records a book left out of the run, e.g. because it is already in the library."""
+        with self._lock:
+            self.skipped += 1
+            self.books_total -= 1
+        self.tick()
+
+    def books_left_out(self, books: int) -> None:
+        """Records book links of a fetched list that are not scraped, e.g. beyond the limit."""
+        with self._lock:
+            self.books_total -= books
+        self.tick()
+
+    def book_failed(self) -> None:
+        """Records a book that could not be scraped and was set aside for a later retry."""
+        with self._lock:
+            self.failed += 1
+            self.books_total -= 1
+        self.tick()
+
+    def record_fetch(self, url: str, size: int, seconds: float, error: BaseException | None) -> None:
+        """``goodreads_miner.fetch.Fetcher`` observer counting bytes and failed requests."""
+        with self._lock:
+            self.bytes += size
+            if error is not None:
+                self.errors += 1
+
+    def tick(self) -> None:
+        """Prints a status line if the reporting interval has elapsed."""
+        if self.quiet or time.monotonic() < self._next_report:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_report:
+                return
+            self._next_report = now + self.interval
+        self._write(self.status(), final=False)
+
+    def eta(self) -> float | None:
+        """Seconds left for the books discovered so far, extrapolated to unfetched lists when possible."""
+        elapsed = time.monotonic() - self.started
+        if not self.books or not elapsed:
+            return None
+        total = self.books_total
+        if self.lists_total and self.lists:
+            total = self.books_total / self.lists * self.lists_total
+        return max(total - self.books, 0) / (self.books / elapsed)
+
+    def status(self) -> str:
+        """Returns the current status line."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        parts = [
+            f"Books {self.books}/{self.books_total}",
+            f"{self.books / elapsed:.1f} books/s",
+            f"{format_bytes(self.bytes / elapsed)}/s",
+            f"{self.errors} errors",
+        ]
+        if self.skipped:
+            parts.append(f"{self.skipped} skipped")
+        if self.failed:
+            parts.append(f"{self.failed} failed")
+        for name, read in self.metrics.items():
+            parts.append(f"{name} {read()}")
+        eta = self.eta()
+        if eta is not None:
+            parts.append(f"ETA {format_duration(eta)}")
+        return " | ".join(parts)
+
+    def finish(self) -> None:
+        """Prints the final summary line."""
+        if self.quiet:
+            return
+        elapsed = time.monotonic() - self.started
+        failed = f", {self.failed} failed" if self.failed else ""
+        self._write(
+            f"Done: {self.books} books from {self.lists} lists in {format_duration(elapsed)}, "
+            f"{self.skipped} skipped{failed}, {format_bytes(self.bytes)} downloaded, {self.errors} errors",
+            final=True,
+        )
+
+    def _write(self, line: str, final: bool) -> None:
+        if self.stream.isatty():
+            self.stream.write("\r\033[K" + line + ("\n" if final else ""))
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
@@ -0,0 +1,130 @@
+"""
+Field projection: scrape only the columns a job needs.
+
+``parse_fields`` reads a selection such as "Book Id,ISBN13". ``book_stages``
+pushes it down into extraction: ``parse_book`` skips the lookups of the fields
+left out (the ld+json book data, the first publication year, the "Last, First"
+author name, the ISBN-10) and the books hold only the selected fields.
+``save_import`` writes the other columns blank, so the CSV still imports.
+
+When every selected field is known from the list page ("Book Id" and
+"Title"), book pages are not fetched at all: one request per list page
+instead of one per book.
+
+Usage Example:
+```python
+fetch_list, scrape = book_stages(parse_fields("Book Id,Title"))
+books = list(Pipeline(fetch_list, scrape, today).run(list_urls))
+```
+"""
+
+from functools import partial
+from typing import Callable
+
+from goodreads_miner.save_csv import DATA_FIELDS
+from goodreads_miner.scraper import (
+    DERIVED_FIELDS,
+    INFO_FIELDS,
+    YEAR_FIELD,
+    get_books,
+    get_id,
+    get_list_entries,
+    scrape_book,
+)
+
+# Fields read from the list page
+LIST_FIELDS = frozenset({"Book Id", "Title"})
+
+# Fields that only a book page has
+PAGE_FIELDS = (frozenset(INFO_FIELDS) | frozenset(DERIVED_FIELDS) | {YEAR_FIELD}) - LIST_FIELDS
+
+
+def parse_fields(text: str) -> frozenset[str]:
+    """
+    Parses a comma-separated selection of CSV columns, matched case-insensitively.
+
+    Raises:
+    - ValueError: For unknown columns or an empty selection.
+    """
+    columns = {field.lower(): field for field in DATA_FIELDS}
+    selected, unknown = set(), []
+    for name in text.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name.lower() in columns:
+            selected.add(columns[name.lower()])
+        else:
+            unknown.append(name)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)} (expected some of: {', '.join(DATA_FIELDS)})")
+    if not selected:
+        raise ValueError("No fields selected")
+    return frozenset(selected)
+
+
+def needs_book_page(fields: frozenset[str]) -> bool:
+    """Whether some selected field is only found on book pages."""
+    return not fields.isdisjoint(PAGE_FIELDS)
+
+
+class ListLink(str):
+    """A book link that carries the title of its list entry."""
+
+    book_title: str | None
+
+    def __new__(cls, link: str, book_title: str | None = None):
+        self = super().__new__(cls, link)
+        self.book_title = book_title
+        return self
+
+
+class ListBooks:
+    """
+    Books built from their list entry, without fetching the book page.
+
+    ``fetch_list`` and ``scrape`` are ``Pipeline`` stages: the first returns the
+    links of a list as ``ListLink`` with their title, the second turns a link into
+    a book. Titles travel with the links, so links left out of the run (by
+    ``limit``, ``sample``, the library or the deadline) hold no memory once dropped.
+
+    Parameters:
+    - fields (frozenset[str]): The selected fields, none of them in ``PAGE_FIELDS``.
+    - get_entries (Callable | None): Returns the (book URL, title) pairs of a list URL.
+      Default is ``get_list_entries``.
+    """
+
+    def __init__(self, fields: frozenset[str], get_entries: Callable[[str], list[tuple[str, str]]] | None = None):
+        self.fields = fields
+        self.get_entries = get_entries or get_list_entries
+
+    def fetch_list(self, url: str) -> list[str]:
+        return [ListLink(link, title) for link, title in self.get_entries(url)]
+
+    def scrape(self, link: str, today: str) -> dict:
+        book = {"Book Id": get_id(link), "Title": getattr(link, "book_title", None), "Date Added": today}
+        return {name: value for name, value in book.items() if name in self.fields}
+
+
+def book_stages(
+    fields: frozenset[str] | None,
+    fetch_list: Callable[[str], list[str]] = get_books,
+    scrape: Callable[..., dict] = scrape_book,
+) -> tuple[Callable[[str], list[str]], Callable[[str, str], dict]]:
+    """
+    Returns the list fetch and book scrape stages extracting only ``fields``.
+
+    Parameters:
+    - fields (frozenset[str] | None): The selected fields, or None for every field.
+    - fetch_list (Callable): List stage used when book pages are fetched.
+    - scrape (Callable): Book stage, called with ``fields=fields`` when a selection is given.
+
+    Returns:
+    - tuple: The ``fetch_list`` and ``scrape`` arguments of ``Pipeline``.
+    """
+    if fields is None:
+        return fetch_list, scrape
+    if needs_book_page(fields):
+        return fetch_list, partial(scrape, fields=fields)
+    books = ListBooks(fields)
+    return books.fetch_list, books.scrape
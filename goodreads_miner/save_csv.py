@@ -3,15 +3,70 @@ This module handles the saving of all scrapped book data into a CSV file.
 '''
 import csv
 import os
+from typing import Iterable, Iterator
 
+from goodreads_miner.tracing import span
 
-def save_import(data: list[dict], filename: str = "data.csv", bookshelf: str = "imported by Goodreads miner", output_dir: str | None = None,) -> None:
+DATA_FIELDS: list[str] = [
+    # List of field names (column headers) for the CSV
+    # Customize this list based on your specific book data structure
+    "Book Id",
+    "Title",
+    "Author",
+    "Author l-f",
+    "Additional Authors",
+    "ISBN",
+    "ISBN13",
+    "My Rating",
+    "Average Rating",
+    "Publisher",
+    "Binding",
+    "Number of Pages",
+    "Year Published",
+    "Original Publication Year",
+    "Date Read",
+    "Date Added",
+    "Bookshelves",
+    "Bookshelves with positions",
+    "Exclusive Shelf",
+    "My Review",
+    "Spoiler",
+    "Private Notes",
+    "Read Count",
+    "Owned Copies",
+]
+
+
+# Both shelf columns get the ``bookshelf`` of the import
+SHELF_FIELDS: tuple[str, ...] = ("Bookshelves", "Exclusive Shelf")
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def iter_rows(data: Iterable[dict], bookshelf: str) -> Iterator[list]:
+    """
+    Yields each book as a list of values in ``DATA_FIELDS`` order, with the shelf columns set.
+
+    Missing fields become "" and unknown keys are ignored, like ``csv.DictWriter(extrasaction="ignore")``.
+    The books themselves are left untouched.
+    """
+    blanks = [""] * len(DATA_FIELDS)
+    first, second = (DATA_FIELDS.index(field) for field in SHELF_FIELDS)
+    for book in data:
+        row = list(map(book.get, DATA_FIELDS, blanks))
+        row[first] = row[second] = bookshelf
+        yield row
+
+
+def save_import(data: Iterable[dict], filename: str = "data.csv", bookshelf: str = "imported by Goodreads miner", output_dir: str | None = None, append: bool = False,) -> None:
     '''
     Saves the scraped book information into a CSV file.
 
     Args:
-        data (list[dict]): A list of dictionaries containing book information.
+        data (Iterable[dict]): Dictionaries containing book information. They are not modified.
         filename (str, optional): The name of the CSV file to save the data. Defaults to "data.csv".
+        append (bool, optional): Add the rows to an existing file instead of overwriting it;
+            the header is only written when the file is new or empty. Defaults to False.
 
     Example:
         >>> book_data = [
@@ -21,49 +76,22 @@ def save_import(data: list[dict], filename: str = "data.csv", bookshelf: str = "
         >>> save_import(book_data, "my_books.csv")
 
     Note:
-        - The function creates or overwrites the specified CSV file.
+        - The function creates or overwrites the specified CSV file, unless append is set.
         - The data should be a list of dictionaries, where each dictionary represents a book's details.
         - The fieldnames in the CSV file correspond to the keys in the dictionaries.
+        - Rows are written in bulk through a large write buffer; the output is the same as
+          writing each dictionary with ``csv.DictWriter``.
     '''
-    data_fields: list[str] = [
-        # List of field names (column headers) for the CSV
-        # Customize this list based on your specific book data structure
-        "Book Id",
-        "Title",
-        "Author",
-        "Author l-f",
-        "Additional Authors",
-        "ISBN",
-        "ISBN13",
-        "My Rating",
-        "Average Rating",
-        "Publisher",
-        "Binding",
-        "Number of Pages",
-        "Year Published",
-        "Original Publication Year",
-        "Date Read",
-        "Date Added",
-        "Bookshelves",
-        "Bookshelves with positions",
-        "Exclusive Shelf",
-        "My Review",
-        "Spoiler",
-        "Private Notes",
-        "Read Count",
-        "Owned Copies",
-    ]
-
     # Resolve file path
     base_dir = output_dir if output_dir else os.getcwd()
     os.makedirs(base_dir, exist_ok=True)
     file_path = os.path.join(base_dir, filename)
 
-    with open(file_path, "w", newline="", encoding="utf8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=data_fields, extrasaction="ignore")
-        writer.writeheader()
+    write_header = not append or not os.path.exists(file_path) or os.path.getsize(file_path) == 0
 
-        for row in data:
-            row["Bookshelves"] = bookshelf
-            row["Exclusive Shelf"] = bookshelf
-            writer.writerow(row)
+    with span("save_import", file=file_path):
+        with open(file_path, "a" if append else "w", newline="", encoding="utf8", buffering=WRITE_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            if write_header:
+                writer.writerow(DATA_FIELDS)
+            writer.writerows(iter_rows(data, bookshelf))
@@ -7,9 +7,28 @@ Dependencies:
 - bs4 (BeautifulSoup)
 
 Functions:
+- set_fetcher(fetcher) -> None:
+  Routes every page download of this module through the given callable (e.g. a
+  ``goodreads_miner.fetch.Fetcher``); None restores plain ``urlopen``.
+
+- fetch_page(url: str):
+  Downloads a page with the configured fetcher.
+
 - get_books(url: str) -> list[str]:
   Returns a list of book URLs from the given Goodreads page URL.
 
+- parse_books(source) -> list[str]:
+  Returns the book URLs found in the HTML of a Goodreads list page.
+
+- get_list_entries(url: str) -> list[tuple[str, str]]:
+  Returns the (book URL, title) pairs of the given Goodreads list URL.
+
+- parse_list_entries(source) -> list[tuple[str, str]]:
+  Returns the (book URL, title) pairs found in the HTML of a Goodreads list page.
+
+- release_soup(soup) -> None:
+  Frees a BeautifulSoup tree immediately once the data has been extracted.
+
 - get_isbn10(isbn) -> str | None:
   Returns the ISBN-10 of the given ISBN-13 if valid, otherwise returns None.
 
@@ -26,9 +45,12 @@ Functions:
 - parse_name(fullname: str) -> str | None:
   Parses and formats the author's full name into "Last Name, First Name" format.
 
-- scrape_book(book_url: str, date: str, bookshelf: str = "imported") -> dict[str, int | str | None]:
+- scrape_book(book_url: str, date: str, bookshelf: str = "imported", fields=None) -> dict[str, int | str | None]:
   Scrapes detailed information about a book from the given Goodreads book URL and returns a 
-  dictionary containing various details such as title, author, ISBN, etc.
+  dictionary containing various details such as title, author, ISBN, etc., or only ``fields``.
+
+- parse_book(source, book_url: str, today: str, bookshelf: str = "imported", fields=None) -> dict[str, int | str | None]:
+  Same as scrape_book, but from the already downloaded HTML of the book page.
 
 Usage Example:
 ```python
@@ -56,8 +78,56 @@ from random import randint
 from urllib.error import HTTPError
 from urllib.request import urlopen
 
+from typing import Collection
+
 import bs4
 
+from goodreads_miner.tracing import span
+
+GOODREADS_URL = "https://www.goodreads.com"
+
+# Fields read from the ld+json book data of a book page, in ``get_book_infos`` order
+INFO_FIELDS: tuple[str, ...] = (
+    "Title",
+    "Author",
+    "Additional Authors",
+    "ISBN13",
+    "Average Rating",
+    "Binding",
+    "Number of Pages",
+)
+# Fields derived from the book data
+DERIVED_FIELDS: dict[str, str] = {"Author l-f": "Author", "ISBN": "ISBN13"}
+YEAR_FIELD = "Original Publication Year"
+
+_fetcher = None
+
+
+def set_fetcher(fetcher) -> None:
+    """
+    Routes every page download of this module through ``fetcher``.
+
+    Parameters:
+    - fetcher: A callable taking a URL and returning the page body, or None to use ``urlopen``.
+    """
+    global _fetcher
+    _fetcher = fetcher
+
+
+def fetch_page(url: str):
+    """
+    Downloads a page with the configured fetcher, or ``urlopen`` when none is set.
+
+    Parameters:
+    - url (str): The URL to download.
+
+    Returns:
+    - The page body (bytes or a file-like response), ready for BeautifulSoup.
+    """
+    if _fetcher is None:
+        return urlopen(url)
+    return _fetcher(url)
+
 
 def get_books(url: str) -> list[str]:
     """
@@ -69,9 +139,76 @@ def get_books(url: str) -> list[str]:
     Returns:
     - list[str]: A list of book URLs.
     """
-    source = urlopen(url)
+    with span("get_books", url=url):
+        with span("fetch"):
+            source = fetch_page(url)
+        with span("parse"):
+            return parse_books(source)
+
+
+def parse_books(source) -> list[str]:
+    """
+    Extracts the book URLs from the HTML of a Goodreads list page.
+
+    Parameters:
+    - source: The page HTML (bytes, str or file-like).
+
+    Returns:
+    - list[str]: A list of book URLs.
+    """
     soup = bs4.BeautifulSoup(source, "html.parser")
-    return [a.get("href") for a in soup.find_all("a", class_="bookTitle")]
+    links = [a.get("href") for a in soup.find_all("a", class_="bookTitle")]
+    release_soup(soup)
+    return links
+
+
+def get_list_entries(url: str) -> list[tuple[str, str]]:
+    """
+    Retrieves the book URLs of the provided Goodreads list URL with their titles.
+
+    Parameters:
+    - url (str): The URL of the Goodreads page.
+
+    Returns:
+    - list[tuple[str, str]]: A list of (book URL, title) pairs.
+    """
+    with span("get_list_entries", url=url):
+        with span("fetch"):
+            source = fetch_page(url)
+        with span("parse"):
+            return parse_list_entries(source)
+
+
+def parse_list_entries(source) -> list[tuple[str, str]]:
+    """
+    Extracts the book URLs and titles from the HTML of a Goodreads list page.
+
+    Parameters:
+    - source: The page HTML (bytes, str or file-like).
+
+    Returns:
+    - list[tuple[str, str]]: A list of (book URL, title) pairs.
+    """
+    soup = bs4.BeautifulSoup(source, "html.parser")
+    entries = [(a.get("href"), a.get_text(" ", strip=True)) for a in soup.find_all("a", class_="bookTitle")]
+    release_soup(soup)
+    return entries
+
+
+def release_soup(soup) -> None:
+    """
+    Frees a parse tree right away instead of at the next cyclic garbage collection.
+
+    The tree is full of parent/child reference cycles. ``decompose()`` breaks them,
+    but called on the document root it does not reach the root's children, so
+    each top-level node is decomposed first.
+
+    Parameters:
+    - soup: BeautifulSoup object that is no longer needed.
+    """
+    for child in list(soup.contents):
+        child.decompose()
+    soup.decompose()
 
 
 def get_isbn10(isbn) -> str | None:
@@ -189,7 +326,10 @@ def parse_name(fullname: str) -> str | None:
 
 
 def scrape_book(
-    book_url: str, today: str, bookshelf: str = "imported by Goodreads Miner"
+    book_url: str,
+    today: str,
+    bookshelf: str = "imported by Goodreads Miner",
+    fields: Collection[str] | None = None,
 ) -> dict[str, int | str | None]:
     """
     Scrapes detailed information about a book from the given Goodreads book URL.
@@ -198,17 +338,61 @@ def scrape_book(
     - book_url (str): The URL of the book on Goodreads.
     - today (str): The current date in the format "YYYY-MM-DD".
     - bookshelf (str): The name of the bookshelf. Default is "imported by Goodreads Miner".
+    - fields (Collection[str] | None): Only extract these fields, see ``parse_book``.
 
     Returns:
     - dict[str, int | str | None]: A dictionary containing various details such as title, author, ISBN, etc.
     """
-    url: str = "https://www.goodreads.com" + book_url
-    try:
-        source = urlopen(url)
-    except HTTPError:
-        time.sleep(randint(1, 5))
-        source = urlopen(url)
-    soup = bs4.BeautifulSoup(source, "html.parser")
+    url: str = GOODREADS_URL + book_url
+    with span("scrape_book", url=book_url):
+        try:
+            with span("fetch"):
+                source = fetch_page(url)
+        except HTTPError:
+            with span("retry sleep"):
+                time.sleep(randint(1, 5))
+            with span("fetch", retry=True):
+                source = fetch_page(url)
+        with span("parse"):
+            return parse_book(source, book_url, today, bookshelf, fields)
+
+
+def parse_book(
+    source,
+    book_url: str,
+    today: str,
+    bookshelf: str = "imported by Goodreads Miner",
+    fields: Collection[str] | None = None,
+) -> dict[str, int | str | None]:
+    """
+    Extracts detailed information about a book from the HTML of its Goodreads page.
+
+    With ``fields``, only those fields are extracted and returned: the ld+json book
+    data, the first publication year and the derived "Author l-f" and "ISBN" are
+    only looked up when a selected field needs them, and the page is not parsed
+    at all when none does.
+
+    Parameters:
+    - source: The book page HTML (bytes, str or file-like).
+    - book_url (str): The URL of the book on Goodreads, used for the Book Id.
+    - today (str): The current date in the format "YYYY-MM-DD".
+    - bookshelf (str): The name of the bookshelf. Default is "imported by Goodreads Miner".
+    - fields (Collection[str] | None): The fields to extract. Default is every field.
+
+    Returns:
+    - dict[str, int | str | None]: A dictionary containing various details such as title, author, ISBN, etc.
+    """
+    wanted = (lambda field: True) if fields is None else fields.__contains__
+    needs_infos = any(map(wanted, INFO_FIELDS)) or any(map(wanted, DERIVED_FIELDS))
+    infos = (None,) * len(INFO_FIELDS)
+    year_first_published = None
+    if needs_infos or wanted(YEAR_FIELD):
+        soup = bs4.BeautifulSoup(source, "html.parser")
+        if needs_infos:
+            infos = get_book_infos(soup)
+        if wanted(YEAR_FIELD):
+            year_first_published = get_year_first_published(soup)
+        release_soup(soup)
     (
         title,
         author,
@@ -217,17 +401,17 @@ def scrape_book(
         avg_rating,
         book_format,
         num_pages,
-    ) = get_book_infos(soup)
+    ) = infos
     book_id = book_url.replace("/book/show/", "")
-    return {
+    book = {
         "Book Id": get_id(book_id),
         "Title": title,
         "Author": author,
-        "Author l-f": parse_name(author),
+        "Author l-f": parse_name(author) if wanted("Author l-f") else None,
         "Additional Authors": more_authors,
-        "Original Publication Year": get_year_first_published(soup),
+        "Original Publication Year": year_first_published,
         "ISBN13": f'="{isbn13}"',
-        "ISBN": f'="{get_isbn10(isbn13)}"',
+        "ISBN": f'="{get_isbn10(isbn13)}"' if wanted("ISBN") else None,
         "Number of Pages": num_pages,
         "Date Added": today,
         "Exclusive Shelf": bookshelf,
@@ -235,3 +419,6 @@ def scrape_book(
         "Binding": book_format,
         "Average Rating": avg_rating,
     }
+    if fields is None:
+        return book
+    return {name: value for name, value in book.items() if name in fields}
@@ -0,0 +1,261 @@
+"""
+Long-running scraping service with a small local HTTP API.
+
+A single process keeps its connection pool, response cache and parsed-book memo
+warm across jobs, so many small requests stay cheap. Jobs run concurrently in a
+thread pool, each one through the regular ``Pipeline``. Books and lists that fail
+do not fail their job: they are recorded in ``<id>.failed.jsonl`` next to its CSV
+and counted in its "failures".
+
+HTTP API (JSON unless noted):
+- GET  /health               Service status and cache statistics.
+- POST /jobs                 Submit {"url": "<list url>"} or {"urls": [...]}, with an
+                             optional "bookshelf". Returns the job, with its "id".
+- GET  /jobs                 All jobs.
+- GET  /jobs/<id>            Status of a job: queued, running, done or failed.
+- GET  /jobs/<id>/csv        The import CSV of a finished job (text/csv).
+
+Usage Example:
+```bash
+python -m goodreads_miner.main serve --port 8080
+curl -X POST localhost:8080/jobs -d '{"url": "https://www.goodreads.com/list/show/1.Best"}'
+```
+"""
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+from goodreads_miner import scraper
+from goodreads_miner.deadletter import DeadLetterQueue, checked
+from goodreads_miner.fetch import ConnectionPool, Fetcher, ResponseCache
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.progress import Progress
+from goodreads_miner.save_csv import save_import
+
+
+class BookMemo:
+    """
+    Memoizes parsed books by URL across jobs, for a while.
+
+    Books scraped without book data (no "Title", e.g. an error page) are not kept,
+    so the next job scrapes them again.
+
+    Parameters:
+    - scrape (Callable): The scraping function to memoize (e.g. ``scrape_book``).
+    - max_entries (int): Maximum number of books kept; the oldest are evicted first.
+    - ttl (float): Seconds a book stays valid.
+    """
+
+    def __init__(self, scrape: Callable[[str, str], dict], max_entries: int = 100_000, ttl: float = 3600):
+        self.scrape = scrape
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._books: dict[str, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, link: str, today: str) -> dict:
+        with self._lock:
+            entry = self._books.get(link)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._books[link]
+                entry = None
+        if entry is not None:
+            book = entry[1]
+        else:
+            book = self.scrape(link, today)
+            if book.get("Title") is not None:
+                with self._lock:
+                    self._books.pop(link, None)
+                    self._books[link] = (time.monotonic() + self.ttl, book)
+                    if len(self._books) > self.max_entries:
+                        del self._books[next(iter(self._books))]
+        # Hand out copies: every job has its own "Date Added"
+        return {**book, "Date Added": today}
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+
+class Job:
+    """A batch of list URLs scraped into one import CSV, with its failures next to it."""
+
+    def __init__(self, urls: list[str], bookshelf: str, output_dir: Path):
+        self.id = uuid.uuid4().hex[:12]
+        self.urls = urls
+        self.bookshelf = bookshelf
+        self.status = "queued"
+        self.error: str | None = None
+        self.path: Path | None = None
+        self.progress = Progress(quiet=True)
+        self.failed = DeadLetterQueue(output_dir / f"{self.id}.failed.jsonl")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "urls": self.urls,
+            "bookshelf": self.bookshelf,
+            "lists": self.progress.lists,
+            "books": self.progress.books,
+            "books_total": self.progress.books_total,
+            "failures": self.failed.count,
+            "error": self.error,
+        }
+
+
+class Service:
+    """
+    Schedules scraping jobs and keeps shared state warm between them.
+
+    Parameters:
+    - output_dir (str | Path): Where the CSV of every job is written.
+    - workers (int): Number of concurrent book scrapers per job.
+    - max_jobs (int): Number of jobs running at the same time.
+    - fetch_list (Callable): Returns the book URLs of a list URL. Default is ``get_books``.
+    - scrape (Callable): Scrapes a book URL into a dict. Default is ``scrape_book``.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path = "jobs",
+        workers: int = 4,
+        max_jobs: int = 2,
+        fetch_list: Callable[[str], list[str]] = scraper.get_books,
+        scrape: Callable[[str, str], dict] = scraper.scrape_book,
+    ):
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.fetch_list = fetch_list
+        self.memo = BookMemo(scrape)
+        self.pool = ConnectionPool()
+        self.cache = ResponseCache()
+        self.fetcher = Fetcher(pool=self.pool, cache=self.cache)
+        self.jobs: dict[str, Job] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs)
+        self._lock = threading.Lock()
+
+    def submit(self, urls: list[str], bookshelf: str = "imported by Goodreads miner") -> Job:
+        """Queues a job scraping ``urls`` and returns it."""
+        job = Job(urls, bookshelf, self.output_dir)
+        with self._lock:
+            self.jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        try:
+            pipeline = Pipeline(
+                self.fetch_list,
+                checked(self.memo),
+                str(date.today()),
+                book_workers=self.workers,
+                on_failure=job.failed,
+                progress=job.progress,
+            )
+            data = list(pipeline.run(job.urls))
+            save_import(data, f"{job.id}.csv", bookshelf=job.bookshelf, output_dir=str(self.output_dir))
+            job.path = self.output_dir / f"{job.id}.csv"
+            job.status = "done"
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.status = "failed"
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "jobs": len(self.jobs),
+            "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            "memo": len(self.memo),
+        }
+
+    def make_server(self, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+        """Creates the HTTP server of the API (not started)."""
+        server = ThreadingHTTPServer((host, port), ServiceHandler)
+        server.service = self
+        return server
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Routes the HTTP API to the ``Service`` attached to the server."""
+
+    server_version = "GoodreadsMiner"
+
+    @property
+    def service(self) -> Service:
+        return self.server.service
+
+    def send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            return self.send_json(200, self.service.health())
+        if parts == ["jobs"]:
+            return self.send_json(200, [job.to_dict() for job in list(self.service.jobs.values())])
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                return self.send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            if len(parts) == 2:
+                return self.send_json(200, job.to_dict())
+            if parts[2] == "csv":
+                if job.status != "done":
+                    return self.send_json(409, {"error": f"Job is {job.status}"})
+                body = job.path.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            return self.send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            urls = request.get("urls") or ([request["url"]] if request.get("url") else [])
+        except (ValueError, AttributeError):
+            return self.send_json(400, {"error": "Expected a JSON object"})
+        # A string is iterable too, but would become one URL per character
+        if not urls or not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return self.send_json(400, {"error": 'Expected "url" or "urls"'})
+        kwargs = {"bookshelf": request["bookshelf"]} if request.get("bookshelf") else {}
+        job = self.service.submit(urls, **kwargs)
+        self.send_json(202, job.to_dict())
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, output_dir: str = "jobs", workers: int = 4, max_jobs: int = 2) -> None:
+    """Runs the service until interrupted."""
+    service = Service(output_dir, workers=workers, max_jobs=max_jobs)
+    scraper.set_fetcher(service.fetcher)
+    server = service.make_server(host, port)
+    print(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        scraper.set_fetcher(None)
@@ -0,0 +1,212 @@
+"""
+Summary statistics over scraped books, computed on NumPy column arrays.
+
+``load_columns`` reads import CSVs (or ``.npz`` column files written by
+``save_columns``) into one array per column, keeping the first row of every
+"Book Id". ``compute_stats`` then aggregates the "Average Rating", "Number of
+Pages", "Original Publication Year" and "Author" columns with vectorized NumPy
+operations: distributions, histograms, books per decade and books per author.
+
+NumPy is an optional dependency: ``pip install goodreads-miner[stats]``.
+
+Usage Example:
+```python
+columns = load_columns(["data/list.csv"])
+print(format_stats(compute_stats(columns)))
+```
+"""
+
+import csv
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, see the "stats" extra
+    np = None
+
+BOOK_ID = "Book Id"
+TEXT_COLUMNS = ("Book Id", "Author")
+NUMERIC_COLUMNS = ("Average Rating", "Number of Pages", "Original Publication Year")
+PERCENTILES = (25, 50, 75, 90, 99)
+RATING_BINS = (0, 1, 2, 3, 3.5, 4, 4.5, 5)
+PAGE_BINS = (0, 100, 200, 300, 400, 500, 750, 1000)
+
+
+def require_numpy() -> None:
+    """Raises ImportError with installation instructions when NumPy is missing."""
+    if np is None:
+        raise ImportError("The stats command needs NumPy: pip install goodreads-miner[stats]")
+
+
+def to_numbers(values: list[str]) -> "np.ndarray":
+    """Converts CSV cells to floats, with NaN for empty or malformed cells."""
+    text = np.asarray(values, dtype=str)
+    numbers = np.full(len(text), np.nan)
+    filled = text != ""
+    try:
+        numbers[filled] = text[filled].astype(float)
+    except ValueError:
+        # Rare malformed cells: convert one by one
+        for index in np.flatnonzero(filled):
+            try:
+                numbers[index] = float(text[index])
+            except ValueError:
+                pass
+    return numbers
+
+
+def read_csv_columns(path: str | Path) -> dict[str, "np.ndarray"]:
+    """Reads the text and numeric columns of one import CSV."""
+    wanted = TEXT_COLUMNS + NUMERIC_COLUMNS
+    with open(path, newline="", encoding="utf8") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        present = [name for name in wanted if name in header]
+        indices = [header.index(name) for name in present]
+        # Transpose in C, one sequence of cells per column
+        if len(indices) == 1:
+            transposed = [list(map(itemgetter(indices[0]), reader))]
+        else:
+            transposed = list(zip(*map(itemgetter(*indices), reader))) if indices else []
+    cells = dict(zip(present, transposed or [()] * len(present)))
+    rows = len(transposed[0]) if transposed else 0
+    columns = {}
+    for name in wanted:
+        values = cells.get(name, [""] * rows)
+        columns[name] = np.asarray(values, dtype=str) if name in TEXT_COLUMNS else to_numbers(values)
+    return columns
+
+
+def load_columns(paths: Iterable[str | Path]) -> dict[str, "np.ndarray"]:
+    """
+    Loads import CSVs and ``.npz`` column files into one array per column.
+
+    Rows without a "Book Id" are kept; of the others only the first row of every id is.
+
+    Parameters:
+    - paths (Iterable[str | Path]): CSV or ``.npz`` files.
+
+    Returns:
+    - dict[str, np.ndarray]: "Book Id" and "Author" as strings, the numeric columns as floats.
+    """
+    require_numpy()
+    parts = []
+    for path in paths:
+        if Path(path).suffix == ".npz":
+            with np.load(path) as data:
+                parts.append({name: data[name] for name in TEXT_COLUMNS + NUMERIC_COLUMNS})
+        else:
+            parts.append(read_csv_columns(path))
+    if not parts:
+        raise ValueError("No input files")
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    ids = columns[BOOK_ID]
+    _, first = np.unique(ids, return_index=True)
+    keep = np.zeros(len(ids), dtype=bool)
+    keep[first] = True
+    keep |= ids == ""
+    return {name: values[keep] for name, values in columns.items()}
+
+
+def save_columns(columns: dict[str, "np.ndarray"], path: str | Path) -> None:
+    """Writes columns to a compressed ``.npz`` file that ``load_columns`` reads much faster than CSV."""
+    require_numpy()
+    np.savez_compressed(path, **columns)
+
+
+def describe(values: "np.ndarray") -> dict:
+    """Count, mean, standard deviation, range and percentiles of the non-NaN values."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0}
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        **{f"p{p}": float(value) for p, value in zip(PERCENTILES, percentiles)},
+        "max": float(values.max()),
+    }
+
+
+def histogram(values: "np.ndarray", edges: Iterable[float]) -> list[tuple[str, int]]:
+    """Counts the non-NaN values per bin; the last bin is open-ended."""
+    values = values[~np.isnan(values)]
+    edges = np.asarray(tuple(edges), dtype=float)
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    labels = [f"< {edges[0]:g}"]
+    labels += [f"{low:g}-{high:g}" for low, high in zip(edges[:-1], edges[1:])]
+    labels.append(f">= {edges[-1]:g}")
+    return [(label, int(count)) for label, count in zip(labels, counts) if count]
+
+
+def per_decade(years: "np.ndarray") -> list[tuple[int, int]]:
+    """Number of books first published in each decade."""
+    years = years[~np.isnan(years)]
+    decades, counts = np.unique((years // 10 * 10).astype(int), return_counts=True)
+    return [(int(decade), int(count)) for decade, count in zip(decades, counts)]
+
+
+def top_authors(authors: "np.ndarray", top: int = 10) -> list[tuple[str, int]]:
+    """The ``top`` authors with the most books, most first (ties by name)."""
+    names, counts = np.unique(authors[authors != ""], return_counts=True)
+    order = np.lexsort((names, -counts))[:top]
+    return [(str(names[index]), int(counts[index])) for index in order]
+
+
+def compute_stats(columns: dict[str, "np.ndarray"], top: int = 10) -> dict:
+    """
+    Aggregates loaded columns.
+
+    Returns:
+    - dict: "books", "authors", plus distributions and histograms of ratings,
+      page counts and first publication years, and the top authors.
+    """
+    require_numpy()
+    ratings = columns["Average Rating"]
+    pages = columns["Number of Pages"]
+    years = columns["Original Publication Year"]
+    authors = columns["Author"]
+    return {
+        "books": int(len(ratings)),
+        "authors": int(len(np.unique(authors[authors != ""]))),
+        "rating": describe(ratings),
+        "rating_histogram": histogram(ratings, RATING_BINS),
+        "pages": describe(pages),
+        "pages_histogram": histogram(pages, PAGE_BINS),
+        "year": describe(years),
+        "decades": per_decade(years),
+        "top_authors": top_authors(authors, top),
+    }
+
+
+def format_stats(stats: dict) -> str:
+    """Returns a human readable report of ``compute_stats`` results."""
+    lines = [f"{stats['books']} books by {stats['authors']} authors"]
+    for key, title in (("rating", "Average Rating"), ("pages", "Number of Pages"), ("year", "Original Publication Year")):
+        summary = stats[key]
+        if not summary["count"]:
+            lines.append(f"{title}: no values")
+            continue
+        lines.append(
+            f"{title}: {summary['count']} values, mean {summary['mean']:.2f} (std {summary['std']:.2f}), "
+            f"min {summary['min']:g}, median {summary['p50']:g}, p90 {summary['p90']:g}, max {summary['max']:g}"
+        )
+    sections = (
+        ("Ratings", stats["rating_histogram"]),
+        ("Pages", stats["pages_histogram"]),
+        ("Decade first published", [(f"{decade}s", count) for decade, count in stats["decades"]]),
+        ("Top authors", stats["top_authors"]),
+    )
+    for title, rows in sections:
+        if not rows:
+            continue
+        lines.append(f"{title}:")
+        width = max(count for _, count in rows)
+        for label, count in rows:
+            bar = "#" * max(1, round(30 * count / width))
+            lines.append(f"  {label:<24} {count:>8}  {bar}")
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+"""
+Opt-in request tracing written to a local trace file.
+
+``Tracer`` records nested, timed spans (list fetch, book scrape, DNS, connect,
+TLS, time to first byte, body download, retry sleeps, parsing, CSV write) as
+Chrome trace events. The file opens in https://ui.perfetto.dev,
+chrome://tracing or speedscope, with one track per worker thread.
+
+Events are appended to the file as spans end, in the JSON array format that
+trace viewers accept even without its closing bracket, so the trace of an
+interrupted or crashed run is still readable and memory use stays flat.
+
+Instrumented code calls the module-level ``span``, which does nothing until a
+tracer is installed with ``set_tracer``.
+
+Usage Example:
+```python
+tracer = Tracer("run.trace.json")
+set_tracer(tracer)
+with span("scrape_book", url=url):
+    ...
+set_tracer(None)
+tracer.close()
+```
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterator
+
+_tracer = None
+
+
+class Tracer:
+    """
+    Writes spans as Chrome trace "complete" events.
+
+    Parameters:
+    - path (str | Path): The trace file, overwritten.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.spans = 0
+        self._pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._file = open(self.path, "w", encoding="utf8")
+        self._file.write("[\n")
+
+    def _now(self) -> float:
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _write(self, event: dict) -> None:
+        # Called with the lock held
+        self._file.write(json.dumps(event, default=str) + ",\n")
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[dict]:
+        """
+        Times the wrapped block as a span of the current thread.
+
+        The yielded dict holds the span arguments and can be updated inside the
+        block, e.g. with a response size. A failing block records its error.
+        """
+        start = self._now()
+        try:
+            yield args
+        except BaseException as exc:
+            args["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            duration = self._now() - start
+            thread = threading.current_thread()
+            event = {"name": name, "ph": "X", "ts": start, "dur": duration, "pid": self._pid, "tid": thread.ident}
+            if args:
+                event["args"] = args
+            with self._lock:
+                # Spans ending after close() are dropped; returning here would swallow the block's error
+                if not self._file.closed:
+                    if thread.ident not in self._threads:
+                        self._threads.add(thread.ident)
+                        self._write(
+                            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident, "args": {"name": thread.name}}
+                        )
+                    self._write(event)
+                    self.spans += 1
+
+    def close(self) -> None:
+        """Terminates the JSON array and closes the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps({"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "goodreads_miner"}}))
+            self._file.write("\n]\n")
+            self._file.close()
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Installs ``tracer`` for every ``span`` call, or disables tracing with None."""
+    global _tracer
+    _tracer = tracer
+
+
+def enabled() -> bool:
+    """Whether a tracer is installed."""
+    return _tracer is not None
+
+
+def span(name: str, **args) -> ContextManager[dict]:
+    """Times the wrapped block with the installed tracer; a no-op when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return nullcontext(args)
+    return tracer.span(name, **args)
@@ -0,0 +1,174 @@
+"""
+Watch Goodreads lists and scrape only the books added since the last poll.
+
+``ListWatcher`` keeps, per list URL, a fingerprint of the last ``get_books``
+result and the Book Ids seen so far, in a JSON state file. Its ``new_links``
+method is used as the ``fetch_list`` stage of a ``Pipeline``: an unchanged list
+yields no links at all, a changed one only the links of unseen books. The
+first poll of a list only records its current books as the baseline.
+
+A book that cannot be scraped is forgotten again, so the next poll retries it,
+and a list page that cannot be fetched keeps its previous state: failures are
+reported, and never stop a long-running ``watch``.
+
+Usage Example:
+```python
+watcher = ListWatcher("lists.watch.json")
+watch(watcher, ["https://www.goodreads.com/list/show/1.Best"], "lists.delta.csv", interval=3600)
+```
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+from goodreads_miner.deadletter import checked
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.save_csv import save_import
+from goodreads_miner.scraper import get_books, get_id, scrape_book
+
+
+def fingerprint(links: list[str]) -> str:
+    """Returns a digest of a list's book links, in order."""
+    return hashlib.sha256("\n".join(links).encode("utf8")).hexdigest()
+
+
+class ListWatcher:
+    """
+    Remembers what every watched list looked like at the last poll.
+
+    Parameters:
+    - state_path (str | Path): JSON file holding the state between polls and runs.
+    - fetch_list (Callable): Returns the book URLs of a list URL. Default is ``get_books``.
+    """
+
+    def __init__(self, state_path: str | Path, fetch_list: Callable[[str], list[str]] | None = None):
+        self.state_path = Path(state_path)
+        self.fetch_list = fetch_list or get_books
+        self.state: dict[str, dict] = {}
+        if self.state_path.exists():
+            with open(self.state_path, encoding="utf8") as file:
+                self.state = json.load(file)
+        self.unchanged = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def new_links(self, list_url: str) -> list[str]:
+        """Fetches a list and returns the links of books not seen in earlier polls."""
+        links = self.fetch_list(list_url)
+        digest = fingerprint(links)
+        with self._lock:
+            previous = self.state.get(list_url)
+            if previous is not None and previous["fingerprint"] == digest:
+                self.unchanged += 1
+                return []
+            seen = set(previous["ids"]) if previous is not None else None
+            ids = [get_id(link) for link in links]
+            self.state[list_url] = {
+                "fingerprint": digest,
+                "ids": sorted(set(ids) | (seen or set())),
+                "checked": datetime.now().isoformat(timespec="seconds"),
+            }
+        if seen is None:
+            return []
+        return [link for link, book_id in zip(links, ids) if book_id not in seen]
+
+    def record_failure(self, list_url: str, link: str | None) -> None:
+        """
+        Counts a failed book or list (``link`` None) in ``failed``.
+
+        A failed book is marked unseen again, so that the next poll of its list returns it.
+        """
+        with self._lock:
+            self.failed += 1
+            state = self.state.get(list_url)
+            if link is None or state is None:
+                return
+            state["ids"] = [book_id for book_id in state["ids"] if book_id != get_id(link)]
+            # Diff the list again next time even if it did not change
+            state["fingerprint"] = None
+
+    def save(self) -> None:
+        """Writes the state file atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf8") as file:
+            json.dump(self.state, file, indent=1)
+        os.replace(tmp, self.state_path)
+
+
+def poll(
+    watcher: ListWatcher,
+    list_urls: Iterable[str],
+    delta_path: str | Path,
+    scrape: Callable[[str, str], dict] | None = None,
+    bookshelf: str = "imported by Goodreads miner",
+    workers: int = 4,
+    on_failure: Callable[[str, str | None, Exception], None] | None = None,
+) -> list[dict]:
+    """
+    Polls every list once, appends the new books to ``delta_path`` and returns them.
+
+    Books and lists that fail are counted in ``watcher.failed``, passed to
+    ``on_failure`` if given, and tried again at the next poll.
+    """
+    watcher.unchanged = 0
+    watcher.failed = 0
+
+    def failed(list_url: str, link: str | None, error: Exception) -> None:
+        watcher.record_failure(list_url, link)
+        if on_failure is not None:
+            on_failure(list_url, link, error)
+
+    pipeline = Pipeline(
+        watcher.new_links,
+        checked(scrape or scrape_book),
+        str(date.today()),
+        book_workers=workers,
+        on_failure=failed,
+    )
+    books = list(pipeline.run(list_urls))
+    if books:
+        delta_path = Path(delta_path)
+        save_import(books, delta_path.name, bookshelf=bookshelf, output_dir=str(delta_path.parent), append=True)
+    watcher.save()
+    return books
+
+
+def watch(
+    watcher: ListWatcher,
+    list_urls: list[str],
+    delta_path: str | Path,
+    interval: float = 3600,
+    polls: int | None = None,
+    **poll_options,
+) -> None:
+    """
+    Polls the lists every ``interval`` seconds, ``polls`` times or until interrupted.
+
+    ``poll_options`` are passed to ``poll``. A poll that fails as a whole, e.g.
+    because the delta file cannot be written, is reported and the next one runs.
+    """
+    count = 0
+    while polls is None or count < polls:
+        started = time.monotonic()
+        try:
+            books = poll(watcher, list_urls, delta_path, **poll_options)
+        except Exception as exc:
+            print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Poll failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+            books = None
+        count += 1
+        if books is not None:
+            print(
+                f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {len(books)} new book(s), "
+                f"{watcher.unchanged}/{len(list_urls)} list(s) unchanged"
+                + (f", {watcher.failed} failed (retried at the next poll)" if watcher.failed else "")
+            )
+        if polls is None or count < polls:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -108,6 +108,63 @@ def test():
     """Run tests with pytest"""
     run("pytest tests --color=yes")
 
+def bench_save(rows=1_000_000):
+    """
+    Compare save_import with a row-by-row csv.DictWriter on synthetic books.
+
+    Args:
+        rows (int): Number of books written.
+    """
+    import csv
+    import tempfile
+    import time
+    from goodreads_miner.save_csv import DATA_FIELDS, save_import
+
+    books = [
+        {
+            "Book Id": str(i),
+            "Title": f"Book {i}, \"volume\" {i % 7}",
+            "Author": "Author Name",
+            "Author l-f": "Name, Author",
+            "Additional Authors": "",
+            "ISBN13": f"978{i:010d}",
+            "Average Rating": 4.12,
+            "Binding": "Paperback",
+            "Number of Pages": 320,
+            "Original Publication Year": 1999,
+            "Date Added": "2025-11-01",
+        }
+        for i in range(rows)
+    ]
+    def dictwriter(path):
+        # save_import before the bulk write path
+        with open(path, "w", newline="", encoding="utf8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=DATA_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in books:
+                row["Bookshelves"] = "to-read"
+                row["Exclusive Shelf"] = "to-read"
+                writer.writerow(row)
+
+    def timed(write, path):
+        # CPU time: the disk writes are the same for both and only add noise
+        started = time.process_time()
+        write(path)
+        return time.process_time() - started
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        reference, bulk = Path(tmpdir, "dictwriter.csv"), Path(tmpdir, "bulk.csv")
+        dictwriter_seconds = bulk_seconds = float("inf")
+        # Best of 3, alternating, to smooth out disk and CPU noise
+        for _ in range(3):
+            dictwriter_seconds = min(dictwriter_seconds, timed(dictwriter, reference))
+            bulk_seconds = min(bulk_seconds, timed(lambda path: save_import(books, path.name, bookshelf="to-read", output_dir=tmpdir), bulk))
+        identical = reference.read_bytes() == bulk.read_bytes()
+    print(f"{rows} rows, CPU time: DictWriter {dictwriter_seconds:.2f}s, save_import {bulk_seconds:.2f}s "
+          f"({dictwriter_seconds / bulk_seconds:.1f}x), identical output: {identical}")
+    if not identical:
+        sys.exit(1)
+
 # ========================
 # CLI
 # ========================
@@ -142,6 +199,12 @@ def main():
     # ------------------------
     subparsers.add_parser("test", help="Run tests")
 
+    # ------------------------
+    # bench-save subcommand
+    # ------------------------
+    parser_bench = subparsers.add_parser("bench-save", help="Benchmark save_import against csv.DictWriter")
+    parser_bench.add_argument("--rows", type=int, default=1_000_000, help="Number of books written")
+
     args = parser.parse_args()
 
     if args.command == "release":
@@ -152,6 +215,8 @@ def main():
         )
     elif args.command == "test":
         test()
+    elif args.command == "bench-save":
+        bench_save(rows=args.rows)
 
 
 if __name__ == "__main__":
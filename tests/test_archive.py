@@ -0,0 +1,99 @@
+import io
+import sys
+from unittest.mock import patch
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner.archive import Archive, reparse
+from goodreads_miner.fetch import Fetcher
+
+LIST_URL = "https://www.goodreads.com/list/show/1.Best"
+
+LIST_PAGE = b"""
+<html><body>
+    <a class="bookTitle" href="/book/show/1.One">One</a>
+    <a class="bookTitle" href="/book/show/2.Two">Two</a>
+</body></html>
+"""
+
+BOOK_PAGE = """
+<html>
+    <script type="application/ld+json">
+    {{
+        "isbn": "9781234567897",
+        "name": "{title}",
+        "numberOfPages": 300,
+        "bookFormat": "Hardcover",
+        "author": [{{"name": "John Doe"}}],
+        "aggregateRating": {{"ratingValue": 4.2}}
+    }}
+    </script>
+    <p data-testid="publicationInfo">Published 2010 by Publisher</p>
+</html>
+"""
+
+
+def fill(archive):
+    archive.put(LIST_URL, LIST_PAGE)
+    archive.put("https://www.goodreads.com/book/show/1.One", BOOK_PAGE.format(title="One").encode())
+    archive.put("https://www.goodreads.com/book/show/2.Two", BOOK_PAGE.format(title="Two").encode())
+
+
+# ------------------------
+# Test Archive
+# ------------------------
+def test_archive_roundtrip_and_reload(tmp_path):
+    archive = Archive(tmp_path)
+    archive.put("https://a", b"first")
+    archive.put("https://a", b"second")
+
+    assert archive.get("https://a") == b"second"
+    assert Archive(tmp_path).get("https://a") == b"second"
+
+def test_archive_is_content_addressed(tmp_path):
+    archive = Archive(tmp_path)
+    assert archive.put("https://a", b"same") == archive.put("https://b", b"same")
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+
+def test_archive_missing_url(tmp_path):
+    with pytest.raises(KeyError):
+        Archive(tmp_path).get("https://missing")
+
+@patch("goodreads_miner.fetch.urlopen", return_value=io.BytesIO(b"<html></html>"))
+def test_fetcher_archives_pages(mock_urlopen, tmp_path):
+    archive = Archive(tmp_path)
+    Fetcher(archive=archive)("https://example.com")
+    assert archive.get("https://example.com") == b"<html></html>"
+
+
+# ------------------------
+# Test reparse
+# ------------------------
+def test_reparse_rebuilds_books_offline(tmp_path):
+    fill(Archive(tmp_path))
+    books = list(reparse(tmp_path, [LIST_URL], "2025-11-01", workers=2))
+
+    assert [book["Title"] for book in books] == ["One", "Two"]
+    assert books[0]["Book Id"] == "1"
+    assert books[0]["Date Added"] == "2025-11-01"
+
+def test_reparse_reports_missing_pages(tmp_path):
+    archive = Archive(tmp_path)
+    archive.put(LIST_URL, LIST_PAGE)
+    missing = []
+    books = list(reparse(tmp_path, [LIST_URL, "https://unknown"], "today", workers=1, on_missing=missing.append))
+
+    assert books == []
+    assert "https://unknown" in missing
+    assert "https://www.goodreads.com/book/show/1.One" in missing
+
+def test_main_reparse_command(tmp_path):
+    fill(Archive(tmp_path / "archive"))
+    test_argv = [
+        "main.py", "reparse", "--archive", str(tmp_path / "archive"),
+        "--url", LIST_URL, "--output_dir", str(tmp_path),
+    ]
+    with patch.object(sys, "argv", test_argv):
+        main_module.main()
+
+    content = (tmp_path / "1 - Best.csv").read_text(encoding="utf8")
+    assert "One" in content and "Two" in content
@@ -0,0 +1,183 @@
+import csv
+import sys
+from unittest.mock import patch
+from urllib.error import HTTPError
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner.deadletter import DeadLetterQueue, IncompleteBook, checked, retry_failed
+from goodreads_miner.save_csv import save_import
+
+LIST_URL = "https://www.goodreads.com/list/show/1.Best"
+
+
+def flaky_scrape(broken):
+    def scrape(link, today):
+        if link in broken:
+            raise HTTPError(link, 503, "Service Unavailable", {}, None)
+        return {"Book Id": link.split("/")[-1], "Title": link}
+    return scrape
+
+
+def read_csv(path):
+    with open(path, encoding="utf8") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+# ------------------------
+# Test checked
+# ------------------------
+def test_checked_rejects_books_without_data():
+    with pytest.raises(IncompleteBook):
+        checked(lambda link, today: {"Book Id": "1", "Title": None})("/book/show/1", "2025-11-01")
+    assert checked(lambda link, today: {"Title": "A"})("/book/show/1", "2025-11-01") == {"Title": "A"}
+    # Books projected without a title are not checked
+    assert checked(lambda link, today: {"ISBN13": None})("/book/show/1", "2025-11-01") == {"ISBN13": None}
+
+
+# ------------------------
+# Test DeadLetterQueue
+# ------------------------
+def test_queue_is_created_on_first_failure(tmp_path):
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    assert not queue.path.exists() and len(queue) == 0
+    queue(LIST_URL, "/book/show/1", ValueError("boom"))
+    [entry] = queue.entries()
+    assert entry["url"] == "/book/show/1"
+    assert entry["list"] == LIST_URL
+    assert entry["error"] == "ValueError: boom"
+    assert entry["attempts"] == 1
+
+def test_attempts_are_counted_across_runs(tmp_path):
+    DeadLetterQueue(tmp_path / "failed.jsonl")(LIST_URL, "/book/show/1", ValueError("boom"))
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(LIST_URL, "/book/show/1", ValueError("again"))
+    [entry] = queue.entries()
+    assert entry["attempts"] == 2 and entry["error"] == "ValueError: again"
+
+
+# ------------------------
+# Test retry_failed
+# ------------------------
+def test_retry_appends_recovered_books(tmp_path):
+    output = tmp_path / "list.csv"
+    save_import([{"Book Id": "1", "Title": "One"}], output.name, output_dir=str(tmp_path))
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(LIST_URL, "/book/show/2", ValueError("boom"))
+    queue(LIST_URL, "/book/show/3", ValueError("boom"))
+
+    recovered, remaining = retry_failed(queue, output, scrape=flaky_scrape({"/book/show/3"}))
+
+    assert (recovered, remaining) == (1, 1)
+    assert [row["Book Id"] for row in read_csv(output)] == ["1", "2"]
+    [entry] = queue.entries()
+    assert entry["url"] == "/book/show/3" and entry["attempts"] == 2
+
+def test_retry_removes_empty_queue(tmp_path):
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(LIST_URL, "/book/show/2", ValueError("boom"))
+    assert retry_failed(queue, tmp_path / "list.csv", scrape=flaky_scrape(set())) == (1, 0)
+    assert not queue.path.exists()
+
+
+def test_retry_fetches_failed_lists_again(tmp_path):
+    other_list = "https://www.goodreads.com/list/show/2.Other"
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(other_list, None, HTTPError(other_list, 404, "Not Found", {}, None))
+    queue(LIST_URL, "/book/show/1", ValueError("boom"))
+    [list_entry, _] = queue.entries()
+    assert (list_entry["url"], list_entry["kind"]) == (other_list, "list")
+
+    fetched = []
+
+    def fetch_list(url):
+        fetched.append(url)
+        return ["/book/show/2", "/book/show/3"]
+
+    recovered, remaining = retry_failed(queue, tmp_path / "list.csv", scrape=flaky_scrape(set()), fetch_list=fetch_list)
+
+    assert (recovered, remaining) == (3, 0)
+    assert fetched == [other_list]
+    assert sorted(row["Book Id"] for row in read_csv(tmp_path / "list.csv")) == ["1", "2", "3"]
+    assert not queue.path.exists()
+
+
+def test_retry_keeps_lists_failing_again(tmp_path):
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(LIST_URL, None, ValueError("boom"))
+
+    def fetch_list(url):
+        raise ValueError("again")
+
+    assert retry_failed(queue, tmp_path / "list.csv", fetch_list=fetch_list) == (0, 1)
+    [entry] = queue.entries()
+    assert (entry["url"], entry["kind"], entry["attempts"]) == (LIST_URL, "list", 2)
+
+
+# ------------------------
+# Test main
+# ------------------------
+@patch("goodreads_miner.main.get_books", return_value=["/book/show/1", "/book/show/2"])
+def test_main_failures_do_not_abort_the_run(mock_get_books, tmp_path):
+    test_argv = ["main.py", "--url", LIST_URL, "--quiet", "--output_dir", str(tmp_path)]
+    with patch.object(sys, "argv", test_argv), \
+            patch("goodreads_miner.main.scrape_book", flaky_scrape({"/book/show/2"})):
+        main_module.main()
+    assert [row["Book Id"] for row in read_csv(tmp_path / "1 - Best.csv")] == ["1"]
+    assert [entry["url"] for entry in DeadLetterQueue(tmp_path / "1 - Best.failed.jsonl").entries()] == ["/book/show/2"]
+
+    test_argv = ["main.py", "retry-failed", "--url", LIST_URL, "--quiet", "--output_dir", str(tmp_path)]
+    with patch.object(sys, "argv", test_argv), \
+            patch("goodreads_miner.main.scrape_book", flaky_scrape(set())):
+        main_module.main()
+    assert sorted(row["Book Id"] for row in read_csv(tmp_path / "1 - Best.csv")) == ["1", "2"]
+    assert not (tmp_path / "1 - Best.failed.jsonl").exists()
+
+
+def test_main_file_list_failure_does_not_abort_the_run(tmp_path):
+    other_list = "https://www.goodreads.com/list/show/2.Other"
+    lists = tmp_path / "lists.txt"
+    lists.write_text(f"{LIST_URL}\n{other_list}\n", encoding="utf8")
+
+    def get_books(url):
+        if url == other_list:
+            raise HTTPError(url, 404, "Not Found", {}, None)
+        return ["/book/show/1"]
+
+    test_argv = ["main.py", "--file", str(lists), "--quiet", "--output_dir", str(tmp_path)]
+    with patch.object(sys, "argv", test_argv), patch("goodreads_miner.main.get_books", get_books), \
+            patch("goodreads_miner.main.scrape_book", flaky_scrape(set())):
+        main_module.main()
+
+    assert [row["Book Id"] for row in read_csv(tmp_path / "lists.csv")] == ["1"]
+    [entry] = DeadLetterQueue(tmp_path / "lists.failed.jsonl").entries()
+    assert (entry["url"], entry["kind"]) == (other_list, "list")
+
+
+@patch("goodreads_miner.main.get_books", return_value=["/book/show/1", "/book/show/2"])
+def test_main_successful_run_resolves_earlier_failures(mock_get_books, tmp_path):
+    test_argv = ["main.py", "--url", LIST_URL, "--quiet", "--output_dir", str(tmp_path)]
+    with patch.object(sys, "argv", test_argv), \
+            patch("goodreads_miner.main.scrape_book", flaky_scrape({"/book/show/1"})):
+        main_module.main()
+    assert [entry["url"] for entry in DeadLetterQueue(tmp_path / "1 - Best.failed.jsonl").entries()] == ["/book/show/1"]
+
+    with patch.object(sys, "argv", test_argv), \
+            patch("goodreads_miner.main.scrape_book", flaky_scrape(set())):
+        main_module.main()
+    assert not (tmp_path / "1 - Best.failed.jsonl").exists()
+    assert sorted(row["Book Id"] for row in read_csv(tmp_path / "1 - Best.csv")) == ["1", "2"]
+
+
+def test_resolve_keeps_entries_still_failing(tmp_path):
+    queue = DeadLetterQueue(tmp_path / "failed.jsonl")
+    queue(LIST_URL, "/book/show/1.One", ValueError("boom"))
+    queue(LIST_URL, "/book/show/2.Two", ValueError("boom"))
+    queue("https://www.goodreads.com/list/show/2.Other", None, ValueError("boom"))
+
+    queue.scraped(LIST_URL, {"Book Id": "1"})
+
+    assert queue.resolve() == 1
+    assert [entry["url"] for entry in queue.entries()] == [
+        "/book/show/2.Two",
+        "https://www.goodreads.com/list/show/2.Other",
+    ]
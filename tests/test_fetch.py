@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+import pytest
+from goodreads_miner.fetch import ConnectionPool, Fetcher, ResponseCache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_GET(self):
+        PageHandler.connections.add(self.client_address)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        status, body = (200, b"<html>page</html>") if self.path == "/page" else (404, b"missing")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    PageHandler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# ------------------------
+# Test ConnectionPool
+# ------------------------
+def test_pool_reuses_connections(server):
+    pool = ConnectionPool()
+    for _ in range(3):
+        assert pool.request(f"{server}/page") == b"<html>page</html>"
+    pool.close()
+    assert len(PageHandler.connections) == 1
+
+def test_pool_follows_redirects(server):
+    assert ConnectionPool().request(f"{server}/redirect") == b"<html>page</html>"
+
+def test_pool_raises_http_errors(server):
+    with pytest.raises(HTTPError) as info:
+        ConnectionPool().request(f"{server}/nope")
+    assert info.value.code == 404
+
+
+# ------------------------
+# Test ResponseCache
+# ------------------------
+def test_cache_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+
+def test_cache_ttl():
+    cache = ResponseCache(ttl=-1)
+    cache.put("a", b"1")
+    assert cache.get("a") is None
+
+def test_fetcher_serves_from_cache(server):
+    requests = []
+    fetcher = Fetcher(observers=[lambda *args: requests.append(args)], pool=ConnectionPool(), cache=ResponseCache())
+    assert fetcher(f"{server}/page") == fetcher(f"{server}/page")
+    assert len(requests) == 1
@@ -0,0 +1,97 @@
+import threading
+import time
+from urllib.error import HTTPError
+import pytest
+from goodreads_miner.fetch import Fetcher
+from goodreads_miner.hedging import Hedger
+
+
+class Server:
+    """Fake download whose n-th call sleeps ``delays[n]`` (0 once exhausted) and may fail."""
+
+    def __init__(self, delays=(), errors=()):
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+        if call < len(self.delays):
+            time.sleep(self.delays[call])
+        if call < len(self.errors) and self.errors[call]:
+            raise HTTPError(url, 503, "busy", {}, None)
+        return f"{url} #{call}".encode()
+
+
+def warmed_up(**options) -> Hedger:
+    """A hedger that has seen enough fast responses to start hedging."""
+    hedger = Hedger(min_samples=5, **options)
+    for _ in range(20):
+        hedger.run(Server(), "warmup")
+    return hedger
+
+
+# ------------------------
+# Test Hedger
+# ------------------------
+def test_no_hedging_before_enough_samples():
+    hedger = Hedger(min_samples=5, budget=1)
+    server = Server(delays=[0.2])
+    assert hedger.run(server, "url") == b"url #0"
+    assert hedger.hedges == 0 and server.calls == 1
+
+def test_slow_request_is_hedged_and_hedge_wins():
+    hedger = warmed_up(budget=0.5)
+    server = Server(delays=[1])
+    started = time.monotonic()
+    assert hedger.run(server, "url") == b"url #1"
+    assert time.monotonic() - started < 0.5
+    assert (hedger.hedges, hedger.wins) == (1, 1)
+
+def test_fast_request_is_not_hedged():
+    hedger = warmed_up(budget=0.5)
+    server = Server()
+    hedger.run(server, "url")
+    assert server.calls == 1 and hedger.hedges == 0
+
+def test_budget_caps_hedges():
+    hedger = warmed_up(budget=0)
+    server = Server(delays=[0.2])
+    assert hedger.run(server, "url") == b"url #0"
+    assert server.calls == 1
+    assert (hedger.hedges, hedger.denied) == (0, 1)
+
+def test_hedges_never_exceed_budget():
+    hedger = warmed_up(budget=0.1)
+    for _ in range(10):
+        hedger.run(Server(delays=[0.05]), "url")
+    assert hedger.hedges <= 0.1 * hedger.requests
+    assert hedger.denied > 0
+
+def test_failed_primary_falls_back_to_hedge():
+    hedger = warmed_up(budget=0.5)
+    server = Server(delays=[0.3], errors=[True])
+    assert hedger.run(server, "url") == b"url #1"
+
+def test_primary_error_is_raised_when_all_fail():
+    hedger = warmed_up(budget=0.5)
+    with pytest.raises(HTTPError):
+        hedger.run(Server(delays=[0.3], errors=[True, True]), "url")
+
+def test_invalid_percentile():
+    with pytest.raises(ValueError):
+        Hedger(percentile=100)
+
+
+# ------------------------
+# Test Fetcher integration
+# ------------------------
+def test_fetcher_hedges_downloads():
+    hedger = warmed_up(budget=0.5)
+    fetcher = Fetcher(hedger=hedger)
+    fetcher.download = Server(delays=[1])
+    assert fetcher("url") == b"url #1"
+    assert hedger.wins == 1
@@ -0,0 +1,97 @@
+import csv
+from goodreads_miner.library import LibraryIndex, clean_isbn
+from goodreads_miner.pipeline import Pipeline
+
+
+def write_export(path, rows):
+    with open(path, "w", newline="", encoding="utf8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=["Book Id", "Title", "ISBN", "ISBN13"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# ------------------------
+# Test clean_isbn
+# ------------------------
+def test_clean_isbn():
+    assert clean_isbn('="9781234567897"') == "9781234567897"
+    assert clean_isbn('=""') == ""
+    assert clean_isbn('="None"') == ""
+    assert clean_isbn(None) == ""
+
+
+# ------------------------
+# Test LibraryIndex
+# ------------------------
+def test_library_index_load(tmp_path):
+    export = tmp_path / "export.csv"
+    write_export(export, [
+        {"Book Id": "1", "Title": "One", "ISBN": '="1234567897"', "ISBN13": '="9781234567897"'},
+        {"Book Id": "2", "Title": "Two", "ISBN": '=""', "ISBN13": '=""'},
+    ])
+    library = LibraryIndex.load(str(export))
+
+    assert len(library) == 2
+    assert library.isbns == {"1234567897", "9781234567897"}
+    assert library.has_link("/book/show/1.One")
+    assert not library.has_link("/book/show/3.Three")
+
+def test_library_has_book_by_isbn():
+    library = LibraryIndex(isbns={"9781234567897"})
+    assert library.has_book({"Book Id": "99", "ISBN13": '="9781234567897"'})
+    assert not library.has_book({"Book Id": "99", "ISBN13": '="None"', "ISBN": '="None"'})
+
+
+# ------------------------
+# Test pipeline integration
+# ------------------------
+def test_pipeline_skips_library_books_before_fetching():
+    scraped = []
+
+    def scrape(link, today):
+        scraped.append(link)
+        return {"Book Id": link.split("/")[-1], "ISBN13": '="None"'}
+
+    library = LibraryIndex(book_ids={"1"})
+    pipeline = Pipeline(lambda url: ["/book/show/1", "/book/show/2"], scrape, "today", library=library)
+    books = list(pipeline.run(["a"]))
+
+    assert scraped == ["/book/show/2"]
+    assert books == [{"Book Id": "2", "ISBN13": '="None"'}]
+
+def test_pipeline_drops_library_books_by_isbn():
+    library = LibraryIndex(isbns={"9781234567897"})
+    pipeline = Pipeline(
+        lambda url: ["/book/show/1"],
+        lambda link, today: {"Book Id": "1", "ISBN13": '="9781234567897"'},
+        "today",
+        library=library,
+    )
+    assert list(pipeline.run(["a"])) == []
+
+
+def test_pipeline_library_books_do_not_count_towards_the_limit():
+    links = [f"/book/show/{i}" for i in range(6)]
+    library = LibraryIndex(book_ids={"0", "1", "2"})
+    pipeline = Pipeline(
+        lambda url: links,
+        lambda link, today: {"Book Id": link.split("/")[-1]},
+        "today",
+        library=library,
+        limit=3,
+    )
+    books = list(pipeline.run(["a"]))
+
+    assert [book["Book Id"] for book in books] == ["3", "4", "5"]
+
+
+def test_pipeline_books_dropped_by_isbn_give_their_place_back():
+    def scrape(link, today):
+        book_id = link.split("/")[-1]
+        return {"Book Id": book_id, "ISBN13": '="9781234567897"' if book_id in "01" else '="None"'}
+
+    library = LibraryIndex(isbns={"9781234567897"})
+    pipeline = Pipeline(lambda url: [f"/book/show/{i}" for i in range(5)], scrape, "today", library=library, limit=2)
+    books = list(pipeline.run(["a"]))
+
+    assert [book["Book Id"] for book in books] == ["2", "3"]
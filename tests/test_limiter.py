@@ -0,0 +1,98 @@
+import threading
+import time
+from urllib.error import HTTPError, URLError
+import pytest
+from goodreads_miner.limiter import AdaptiveLimiter, is_overload
+
+
+def http_error(code):
+    return HTTPError("https://example.com", code, "error", {}, None)
+
+
+# ------------------------
+# Test is_overload
+# ------------------------
+@pytest.mark.parametrize("error,expected", [
+    (None, False),
+    (http_error(404), False),
+    (http_error(429), True),
+    (http_error(503), True),
+    (URLError("timed out"), True),
+    (ValueError("parse"), False),
+])
+def test_is_overload(error, expected):
+    assert is_overload(error) == expected
+
+
+# ------------------------
+# Test AdaptiveLimiter
+# ------------------------
+def test_limiter_increases_additively_up_to_ceiling():
+    limiter = AdaptiveLimiter(floor=1, ceiling=4)
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.current == 4
+
+def test_limiter_backs_off_multiplicatively_to_floor():
+    limiter = AdaptiveLimiter(floor=2, ceiling=16, initial=16)
+    limiter.acquire()
+    limiter.release(0.1, http_error(429))
+    assert limiter.current == 8
+    limiter._last_backoff = float("-inf")
+    limiter.acquire()
+    limiter.release(0.1, http_error(500))
+    assert limiter.current == 4
+    for _ in range(5):
+        limiter._last_backoff = float("-inf")
+        limiter.acquire()
+        limiter.release(0.1, http_error(503))
+    assert limiter.current == 2
+
+def test_limiter_backs_off_once_per_round_trip():
+    limiter = AdaptiveLimiter(floor=1, ceiling=16, initial=16)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(0.1, http_error(429))
+    assert limiter.current == 8
+    assert limiter.backoffs == 1
+
+def test_limiter_backs_off_on_latency_spike():
+    limiter = AdaptiveLimiter(floor=1, ceiling=16, initial=8, spike=3)
+    limiter.acquire()
+    limiter.release(0.1)
+    limiter.acquire()
+    limiter.release(1.0)
+    assert limiter.current == 4
+
+def test_limiter_bounds_concurrency():
+    limiter = AdaptiveLimiter(floor=2, ceiling=2)
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal peak
+        with limiter.slot():
+            with lock:
+                peak = max(peak, limiter.in_flight)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+def test_limiter_slot_records_errors():
+    limiter = AdaptiveLimiter(floor=1, ceiling=8, initial=8)
+    with pytest.raises(HTTPError):
+        with limiter.slot():
+            raise http_error(429)
+    assert limiter.current == 4
+
+def test_limiter_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(floor=5, ceiling=2)
@@ -2,11 +2,18 @@ from pathlib import Path
 from unittest.mock import patch, mock_open
 import pytest
 import sys
+import time
+from datetime import datetime, timedelta
 from goodreads_miner import main as main_module
 
 DATA_FILE = "data/data.txt"
 
 
+def drain(data, *args, **kwargs):
+    """``save_import`` stand-in consuming the streamed books, which runs the pipeline."""
+    return list(data)
+
+
 # ------------------------
 # Test: --file argument
 # ------------------------
@@ -15,7 +22,7 @@ DATA_FILE = "data/data.txt"
     "https://www.goodreads.com/list/show/195860.Books_for_Players_of_Sid_Meier_s_Civilization_Games\n"
     "https://www.goodreads.com/list/show/195838.Best_Sci_Fi_and_Fantasy_reads\n"
 ))
-@patch("goodreads_miner.main.save_import")
+@patch("goodreads_miner.main.save_import", side_effect=drain)
 @patch("goodreads_miner.main.get_books", return_value=["/book/show/1", "/book/show/2"])
 @patch("goodreads_miner.main.scrape_book", return_value={"Title": "Book1"})
 def test_main_file(mock_scrape, mock_get_books, mock_save, mock_file):
@@ -47,7 +54,7 @@ def test_main_file(mock_scrape, mock_get_books, mock_save, mock_file):
 # ------------------------
 # Test: --url argument
 # ------------------------
-@patch("goodreads_miner.main.save_import")
+@patch("goodreads_miner.main.save_import", side_effect=drain)
 @patch("goodreads_miner.main.get_books", return_value=["/book/show/1"])
 @patch("goodreads_miner.main.scrape_book", return_value={"Title": "TestBook"})
 def test_main_url(mock_scrape, mock_get_books, mock_save):
@@ -91,7 +98,7 @@ def test_main_invalid_args():
 @patch("builtins.open", new_callable=mock_open, read_data=(
     "\nhttps://www.goodreads.com/list/show/195641.Books_to_read_on_Kashmir\n\n"
 ))
-@patch("goodreads_miner.main.save_import")
+@patch("goodreads_miner.main.save_import", side_effect=drain)
 @patch("goodreads_miner.main.get_books", return_value=["/book/show/1"])
 @patch("goodreads_miner.main.scrape_book", return_value={"Title": "Book1"})
 def test_main_file_empty_lines(mock_scrape, mock_get_books, mock_save, mock_file):
@@ -108,3 +115,111 @@ def test_main_file_empty_lines(mock_scrape, mock_get_books, mock_save, mock_file
         assert mock_get_books.call_count == 1
         assert mock_scrape.call_count == 1
         mock_save.assert_called_once()
+
+
+# ------------------------
+# Test: time budget
+# ------------------------
+def test_get_deadline_none():
+    assert main_module.get_deadline({}) is None
+
+
+def test_get_deadline_earliest_budget_wins():
+    deadline = main_module.get_deadline({"max_runtime": "60", "deadline": "2999-01-01T00:00"})
+    assert 0 < deadline - time.monotonic() <= 60
+
+
+def test_get_deadline_time_already_past_is_tomorrow():
+    past = (datetime.now() - timedelta(minutes=2)).strftime("%H:%M")
+    budget = main_module.get_deadline({"deadline": past}) - time.monotonic()
+    assert 23 * 3600 < budget <= 24 * 3600
+
+
+def test_get_deadline_invalid_values_exit():
+    with pytest.raises(SystemExit):
+        main_module.get_deadline({"deadline": "tomorrow"})
+    for value in ("1h", "0", "-5", "nan", "inf"):
+        with pytest.raises(SystemExit):
+            main_module.get_deadline({"max_runtime": value})
+
+
+@patch("goodreads_miner.main.save_import", side_effect=drain)
+@patch("goodreads_miner.main.get_books", return_value=["/book/show/1"])
+@patch("goodreads_miner.main.scrape_book", return_value={"Title": "Book1"})
+def test_main_file_expired_deadline_reports_skipped(mock_scrape, mock_get_books, mock_save, tmp_path):
+    books = []
+    mock_save.side_effect = lambda data, *args, **kwargs: books.extend(data)
+    lists = tmp_path / "lists.txt"
+    lists.write_text("https://a\nhttps://b\n", encoding="utf8")
+    test_argv = ["main.py", "--file", str(lists), "--deadline", "2000-01-01T00:00", "--output_dir", str(tmp_path)]
+    with patch.object(sys, "argv", test_argv):
+        main_module.main()
+
+    mock_scrape.assert_not_called()
+    assert books == []
+    skipped = (tmp_path / "lists.skipped.txt").read_text(encoding="utf8").split()
+    assert sorted(skipped) == ["https://a", "https://b"]
+
+
+# ------------------------
+# Test: --limit / --sample / --per-list
+# ------------------------
+def test_get_selection():
+    args = {"limit": "10", "sample": "3", "seed": "0", "per_list": "2"}
+    assert main_module.get_selection(args) == {"limit": 10, "per_list": 2, "sample": 3, "seed": 0}
+    assert main_module.get_selection({}) == {}
+    with pytest.raises(SystemExit):
+        main_module.get_selection({"limit": "0"})
+    with pytest.raises(SystemExit):
+        main_module.get_selection({"sample": "many"})
+
+
+@patch("goodreads_miner.main.save_import", side_effect=drain)
+@patch("goodreads_miner.main.get_books", return_value=[f"/book/show/{i}" for i in range(50)])
+@patch("goodreads_miner.main.scrape_book", return_value={"Title": "Book1"})
+def test_main_url_limit(mock_scrape, mock_get_books, mock_save, tmp_path):
+    books = []
+    mock_save.side_effect = lambda data, *args, **kwargs: books.extend(data)
+    url = "https://www.goodreads.com/list/show/195641.Books_to_read_on_Kashmir"
+    test_argv = ["main.py", "--url", url, "--limit", "5", "--output_dir", str(tmp_path), "--quiet"]
+    with patch.object(sys, "argv", test_argv):
+        main_module.main()
+
+    assert mock_scrape.call_count == 5
+    assert len(books) == 5
+
+
+# ------------------------
+# Test: --fields
+# ------------------------
+@patch("goodreads_miner.main.save_import", side_effect=drain)
+@patch("goodreads_miner.main.scrape_book")
+def test_main_url_list_fields_skip_book_pages(mock_scrape, mock_save, tmp_path):
+    books = []
+    mock_save.side_effect = lambda data, *args, **kwargs: books.extend(data)
+    url = "https://www.goodreads.com/list/show/195641.Books_to_read_on_Kashmir"
+    entries = [("/book/show/1.One", "One"), ("/book/show/2.Two", "Two")]
+    test_argv = ["main.py", "--url", url, "--fields", "Book Id,Title", "--output_dir", str(tmp_path), "--quiet"]
+    with patch("goodreads_miner.projection.get_list_entries", return_value=entries), patch.object(sys, "argv", test_argv):
+        main_module.main()
+
+    mock_scrape.assert_not_called()
+    assert sorted(books, key=lambda book: book["Book Id"]) == [{"Book Id": "1", "Title": "One"}, {"Book Id": "2", "Title": "Two"}]
+
+
+def test_main_unknown_field():
+    with patch.object(sys, "argv", ["main.py", "--url", "x", "--fields", "Color"]):
+        with pytest.raises(SystemExit):
+            main_module.main()
+
+
+# ------------------------
+# Test: SkipLog
+# ------------------------
+def test_skip_log_writes_urls_until_closed(tmp_path):
+    log = main_module.SkipLog(tmp_path / "lists.skipped.txt")
+    for i in range(3):
+        log(f"list{i}")
+    log.close()
+    assert (tmp_path / "lists.skipped.txt").read_text(encoding="utf8") == "list0\nlist1\nlist2\n"
+    assert log.count == 3
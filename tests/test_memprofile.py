@@ -0,0 +1,72 @@
+import gc
+import sys
+from unittest.mock import patch
+import bs4
+from goodreads_miner import main as main_module
+from goodreads_miner.memprofile import MemoryProfiler
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.scraper import release_soup
+
+
+# ------------------------
+# Test MemoryProfiler
+# ------------------------
+def test_profiler_records_peak_and_retained():
+    profiler = MemoryProfiler(sample_every=1)
+    profiler.start()
+    try:
+        kept = []
+        with profiler.stage("book parse"):
+            temporary = bytearray(2_000_000)
+            del temporary
+            kept.append(bytearray(500_000))
+    finally:
+        profiler.stop()
+
+    stats = profiler.stages["book parse"]
+    assert stats.calls == 1
+    assert stats.peak >= 2_000_000
+    assert 500_000 <= stats.retained < 2_000_000
+    assert stats.sites
+    assert "book parse" in profiler.report()
+
+def test_profiler_wraps_pipeline_stages():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        pipeline = Pipeline(lambda url: ["/book/show/1"], lambda link, today: {}, "today", profiler=profiler)
+        list(pipeline.run(["a", "b"]))
+    finally:
+        profiler.stop()
+    assert profiler.stages["list fetch"].calls == 2
+    assert profiler.stages["book parse"].calls == 2
+
+
+# ------------------------
+# Test release_soup
+# ------------------------
+def test_release_soup_leaves_no_cycles():
+    soup = bs4.BeautifulSoup("<!DOCTYPE html><html><body><p>a</p><p>b</p></body></html>", "html.parser")
+    gc.collect()
+    gc.disable()
+    try:
+        release_soup(soup)
+        del soup
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+
+
+# ------------------------
+# Test --memory-profile
+# ------------------------
+@patch("goodreads_miner.main.save_import", side_effect=lambda data, *args, **kwargs: list(data))
+@patch("goodreads_miner.main.get_books", return_value=["/book/show/1"])
+@patch("goodreads_miner.main.scrape_book", return_value={"Title": "Book1"})
+def test_main_memory_profile(mock_scrape, mock_get_books, mock_save, capsys):
+    url = "https://www.goodreads.com/list/show/195641.Books_to_read_on_Kashmir"
+    with patch.object(sys, "argv", ["main.py", "--url", url, "--memory-profile", "--quiet"]):
+        main_module.main()
+    report = capsys.readouterr().err
+    for stage in ("list fetch", "book parse", "CSV write"):
+        assert stage in report
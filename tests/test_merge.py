@@ -0,0 +1,101 @@
+import csv
+import sys
+from unittest.mock import patch
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner import merge as merge_module
+from goodreads_miner.merge import merge_imports
+from goodreads_miner.save_csv import DATA_FIELDS
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=["Book Id", "Title", "Date Added"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, encoding="utf8") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    write_csv(first, [
+        {"Book Id": "2", "Title": "Two (old)", "Date Added": "2025-01-01"},
+        {"Book Id": "1", "Title": "One", "Date Added": "2025-01-01"},
+        {"Book Id": "", "Title": "No id A", "Date Added": "2025-01-01"},
+    ])
+    write_csv(second, [
+        {"Book Id": "2", "Title": "Two (new)", "Date Added": "2025-06-01"},
+        {"Book Id": "3", "Title": "Three", "Date Added": "2025-06-01"},
+        {"Book Id": "", "Title": "No id B", "Date Added": "2025-06-01"},
+    ])
+    return [str(first), str(second)]
+
+
+# ------------------------
+# Test merge_imports
+# ------------------------
+@pytest.mark.parametrize("keep,expected", [
+    ("newest", "Two (new)"),
+    ("oldest", "Two (old)"),
+    ("first", "Two (old)"),
+    ("last", "Two (new)"),
+])
+def test_merge_keep_rules(inputs, tmp_path, keep, expected):
+    output = tmp_path / "merged.csv"
+    written = merge_imports(inputs, str(output), keep=keep, chunk_size=2)
+    rows = read_csv(output)
+
+    assert written == len(rows) == 5
+    assert [row["Book Id"] for row in rows] == ["", "", "1", "2", "3"]
+    assert {row["Title"] for row in rows if row["Book Id"] == "2"} == {expected}
+
+def test_merge_writes_import_header(inputs, tmp_path):
+    output = tmp_path / "merged.csv"
+    merge_imports(inputs, str(output))
+    with open(output, encoding="utf8") as csvfile:
+        assert next(csv.reader(csvfile)) == DATA_FIELDS
+
+def test_merge_multi_pass(inputs, tmp_path):
+    output = tmp_path / "merged.csv"
+    with patch.object(merge_module, "FAN_IN", 2):
+        merge_imports(inputs, str(output), chunk_size=1)
+    assert [row["Book Id"] for row in read_csv(output)] == ["", "", "1", "2", "3"]
+
+def test_merge_unknown_rule(inputs, tmp_path):
+    with pytest.raises(ValueError):
+        merge_imports(inputs, str(tmp_path / "merged.csv"), keep="random")
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_merge_invalid_chunk_size(inputs, tmp_path, chunk_size):
+    output = tmp_path / "merged.csv"
+    with pytest.raises(ValueError):
+        merge_imports(inputs, str(output), chunk_size=chunk_size)
+    assert not output.exists()
+
+
+# ------------------------
+# Test merge command
+# ------------------------
+def test_main_merge_command(inputs, tmp_path):
+    output = tmp_path / "out" / "all.csv"
+    test_argv = ["main.py", "merge", *inputs, "--output", str(output), "--keep", "oldest"]
+    with patch.object(sys, "argv", test_argv):
+        main_module.main()
+    assert len(read_csv(output)) == 5
+
+def test_main_unknown_command():
+    with patch.object(sys, "argv", ["main.py", "frobnicate"]):
+        with pytest.raises(SystemExit):
+            main_module.main()
+
+def test_main_merge_invalid_chunk_size(inputs, tmp_path):
+    test_argv = ["main.py", "merge", *inputs, "--output", str(tmp_path / "all.csv"), "--chunk-size", "0"]
+    with patch.object(sys, "argv", test_argv):
+        with pytest.raises(SystemExit, match="Invalid chunk size"):
+            main_module.main()
@@ -0,0 +1,235 @@
+import threading
+import time
+from unittest.mock import patch, mock_open
+import pytest
+from goodreads_miner.pipeline import Pipeline, read_list_urls
+
+
+def fake_get_books(url):
+    return [f"{url}/book/{i}" for i in range(3)]
+
+
+def fake_scrape(link, today):
+    return {"Book Id": link, "Date Added": today}
+
+
+# ------------------------
+# Test read_list_urls
+# ------------------------
+@patch("builtins.open", new_callable=mock_open, read_data="\nlist1\n  list2  \n\n")
+def test_read_list_urls_skips_blank_lines(mock_file):
+    assert list(read_list_urls("lists.txt")) == ["list1", "list2"]
+    mock_file.assert_called_once_with("lists.txt", encoding="utf8")
+
+
+# ------------------------
+# Test Pipeline.run
+# ------------------------
+def test_pipeline_scrapes_every_book():
+    pipeline = Pipeline(fake_get_books, fake_scrape, "2025-11-01", list_workers=2, book_workers=3)
+    books = list(pipeline.run(["a", "b", "c"]))
+
+    assert sorted(book["Book Id"] for book in books) == sorted(
+        f"{url}/book/{i}" for url in "abc" for i in range(3)
+    )
+    assert all(book["Date Added"] == "2025-11-01" for book in books)
+
+
+def test_pipeline_yields_books_in_input_order():
+    """Books finishing out of order are still yielded list by list, in list order."""
+    def get_books(url):
+        time.sleep(0.01 if url in "bd" else 0)
+        return [f"{url}/book/{i}" for i in range(8)]
+
+    def scrape(link, today):
+        time.sleep(0.002 * (8 - int(link[-1])))
+        return fake_scrape(link, today)
+
+    pipeline = Pipeline(get_books, scrape, "today", list_workers=3, book_workers=6)
+    books = list(pipeline.run(["a", "b", "c", "d"]))
+
+    assert [book["Book Id"] for book in books] == [f"{url}/book/{i}" for url in "abcd" for i in range(8)]
+
+
+def test_pipeline_consumes_list_urls_lazily():
+    """Only a bounded number of list URLs is pulled ahead of the consumer."""
+    pulled = []
+
+    def urls():
+        for i in range(10_000):
+            pulled.append(i)
+            yield str(i)
+
+    pipeline = Pipeline(fake_get_books, fake_scrape, "today", queue_size=2)
+    results = pipeline.run(urls())
+    next(results)
+    results.close()
+
+    assert len(pulled) < 100
+
+
+def test_pipeline_overlaps_lists_and_books():
+    """Books of the first list are scraped while the second list is still being fetched."""
+    second_list_started = threading.Event()
+    first_book_scraped = threading.Event()
+
+    def get_books(url):
+        if url == "second":
+            second_list_started.set()
+            assert first_book_scraped.wait(timeout=5)
+        return [f"{url}/book"]
+
+    def scrape(link, today):
+        first_book_scraped.set()
+        return {"Book Id": link}
+
+    pipeline = Pipeline(get_books, scrape, "today", list_workers=2)
+    books = list(pipeline.run(["first", "second"]))
+
+    assert second_list_started.is_set()
+    assert len(books) == 2
+
+
+def test_pipeline_propagates_errors():
+    def scrape(link, today):
+        raise ValueError("boom")
+
+    pipeline = Pipeline(fake_get_books, scrape, "today")
+    with pytest.raises(ValueError):
+        list(pipeline.run(["a"]))
+
+
+def test_pipeline_on_failure_keeps_going():
+    def scrape(link, today):
+        if link.endswith("/1"):
+            raise ValueError("boom")
+        return fake_scrape(link, today)
+
+    failures = []
+    pipeline = Pipeline(fake_get_books, scrape, "today", on_failure=lambda *failure: failures.append(failure))
+    books = list(pipeline.run(["a"]))
+
+    assert [book["Book Id"] for book in books] == ["a/book/0", "a/book/2"]
+    [(list_url, link, error)] = failures
+    assert (list_url, link, str(error)) == ("a", "a/book/1", "boom")
+
+
+def test_pipeline_on_failure_keeps_going_after_a_list_failure():
+    def get_books(url):
+        if url == "b":
+            raise ValueError("404")
+        return fake_get_books(url)
+
+    failures = []
+    pipeline = Pipeline(get_books, fake_scrape, "today", on_failure=lambda *failure: failures.append(failure))
+    books = list(pipeline.run(["a", "b", "c"]))
+
+    assert [book["Book Id"] for book in books] == [f"{url}/book/{i}" for url in "ac" for i in range(3)]
+    [(list_url, link, error)] = failures
+    assert (list_url, link, str(error)) == ("b", None, "404")
+
+
+# ------------------------
+# Test limit, per_list and sample
+# ------------------------
+def test_pipeline_limit_stops_fetching_early():
+    fetched = []
+
+    def get_books(url):
+        fetched.append(url)
+        return fake_get_books(url)
+
+    scraped = []
+
+    def scrape(link, today):
+        scraped.append(link)
+        return fake_scrape(link, today)
+
+    pipeline = Pipeline(get_books, scrape, "today", list_workers=1, limit=4)
+    books = list(pipeline.run(["a", "b", "c", "d"]))
+
+    assert sorted(book["Book Id"] for book in books) == ["a/book/0", "a/book/1", "a/book/2", "b/book/0"]
+    assert sorted(scraped) == sorted(book["Book Id"] for book in books)
+    assert fetched == ["a", "b"]
+
+
+def test_pipeline_per_list_keeps_first_books_of_each_list():
+    pipeline = Pipeline(fake_get_books, fake_scrape, "today", per_list=2)
+    books = list(pipeline.run(["a", "b"]))
+
+    assert sorted(book["Book Id"] for book in books) == ["a/book/0", "a/book/1", "b/book/0", "b/book/1"]
+
+
+def test_pipeline_sample_is_reproducible_with_a_seed():
+    def get_books(url):
+        return [f"{url}/book/{i}" for i in range(100)]
+
+    def run(seed):
+        pipeline = Pipeline(get_books, fake_scrape, "today", sample=5, seed=seed)
+        return sorted(book["Book Id"] for book in pipeline.run(["a"]))
+
+    first = run(7)
+    assert len(first) == 5
+    assert set(first) <= set(get_books("a"))
+    assert run(7) == first
+    assert run(8) != first
+
+
+def test_pipeline_sample_larger_than_list_keeps_every_book():
+    pipeline = Pipeline(fake_get_books, fake_scrape, "today", sample=10, seed=1)
+
+    assert len(list(pipeline.run(["a"]))) == 3
+
+
+# ------------------------
+# Test deadline handling
+# ------------------------
+def test_pipeline_expired_deadline_skips_everything():
+    skipped = []
+    scraped = []
+
+    def scrape(link, today):
+        scraped.append(link)
+        return {}
+
+    pipeline = Pipeline(
+        fake_get_books, scrape, "today", deadline=time.monotonic() - 1, on_skip=skipped.append
+    )
+    assert list(pipeline.run(["a", "b"])) == []
+    assert scraped == []
+    assert sorted(skipped) == ["a", "b"]
+
+
+def test_pipeline_out_of_time_reports_the_rest_of_the_input_in_one_pass():
+    skipped = []
+    fetched = []
+
+    def get_books(url):
+        fetched.append(url)
+        return []
+
+    pipeline = Pipeline(get_books, fake_scrape, "today", deadline=time.monotonic() - 1, on_skip=skipped.append)
+    started = time.monotonic()
+    assert list(pipeline.run(str(i) for i in range(200_000))) == []
+
+    assert time.monotonic() - started < 5
+    assert fetched == []
+    assert sorted(skipped, key=int) == [str(i) for i in range(200_000)]
+    assert pipeline._partially_skipped == set()
+
+
+def test_pipeline_deadline_keeps_completed_books():
+    skipped = []
+    pipeline = Pipeline(fake_get_books, None, "today", book_workers=1, on_skip=skipped.append)
+
+    def scrape(link, today):
+        # The budget runs out while the first book is in flight
+        pipeline.deadline = time.monotonic() - 1
+        return {"Book Id": link}
+
+    pipeline.scrape = scrape
+    books = list(pipeline.run(["a", "b"]))
+
+    assert books == [{"Book Id": "a/book/0"}]
+    # "a" is only partially scraped and "b" not at all: both are reported once
+    assert sorted(skipped) == ["a", "b"]
@@ -0,0 +1,75 @@
+import io
+from unittest.mock import patch
+from goodreads_miner.fetch import Fetcher
+from goodreads_miner.progress import Progress, format_bytes, format_duration
+
+
+class FakeResponse(io.BytesIO):
+    pass
+
+
+# ------------------------
+# Test formatting helpers
+# ------------------------
+def test_format_duration():
+    assert format_duration(42) == "42s"
+    assert format_duration(185) == "3m05s"
+    assert format_duration(3720) == "1h02m"
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KB"
+
+
+# ------------------------
+# Test Progress
+# ------------------------
+def test_progress_counts_and_reports():
+    stream = io.StringIO()
+    progress = Progress(interval=0, stream=stream)
+    progress.list_done(2)
+    progress.book_done()
+    progress.record_fetch("url", 2048, 0.1, None)
+    progress.record_fetch("url", 0, 0.1, OSError())
+
+    assert (progress.lists, progress.books, progress.books_total) == (1, 1, 2)
+    assert progress.bytes == 2048
+    assert progress.errors == 1
+    assert "Books 1/2" in stream.getvalue().splitlines()[-1]
+
+
+def test_progress_is_throttled():
+    stream = io.StringIO()
+    progress = Progress(interval=3600, stream=stream)
+    for _ in range(1000):
+        progress.book_done()
+    assert stream.getvalue() == ""
+
+
+def test_progress_quiet():
+    stream = io.StringIO()
+    progress = Progress(quiet=True, interval=0, stream=stream)
+    progress.list_done(1)
+    progress.book_done()
+    progress.finish()
+    assert stream.getvalue() == ""
+    assert progress.books == 1
+
+
+def test_progress_eta_extrapolates_to_unfetched_lists():
+    progress = Progress(lists_total=4)
+    progress.list_done(10)
+    progress.book_done()
+    progress.started -= 1  # one book per second
+    assert 38 <= progress.eta() <= 40
+
+
+# ------------------------
+# Test Fetcher observers
+# ------------------------
+@patch("goodreads_miner.fetch.urlopen", return_value=FakeResponse(b"<html></html>"))
+def test_fetcher_notifies_observers(mock_urlopen):
+    progress = Progress(quiet=True)
+    body = Fetcher(observers=[progress.record_fetch])("https://example.com")
+    assert body == b"<html></html>"
+    assert progress.bytes == len(body)
@@ -0,0 +1,125 @@
+import json
+from unittest.mock import patch
+import pytest
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.projection import ListBooks, book_stages, needs_book_page, parse_fields
+from goodreads_miner.scraper import parse_book
+
+BOOK_PAGE = """
+<html>
+    <script type="application/ld+json">
+    {
+        "isbn": "9781234567897",
+        "name": "Test Book",
+        "numberOfPages": 300,
+        "bookFormat": "Hardcover",
+        "author": [{"name": "John Doe"}],
+        "aggregateRating": {"ratingValue": 4.2}
+    }
+    </script>
+    <p data-testid="publicationInfo">Published 2010 by Publisher</p>
+</html>
+"""
+
+
+# ------------------------
+# Test parse_fields
+# ------------------------
+def test_parse_fields_matches_columns_case_insensitively():
+    assert parse_fields("book id, ISBN13,") == {"Book Id", "ISBN13"}
+
+
+def test_parse_fields_rejects_unknown_or_empty_selections():
+    with pytest.raises(ValueError, match="Unknown field"):
+        parse_fields("Book Id,Color")
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+
+
+def test_needs_book_page():
+    assert not needs_book_page(frozenset({"Book Id", "Title", "Date Added"}))
+    assert needs_book_page(frozenset({"Book Id", "ISBN13"}))
+    assert needs_book_page(frozenset({"Original Publication Year"}))
+
+
+# ------------------------
+# Test parse_book with fields
+# ------------------------
+def test_parse_book_returns_only_selected_fields():
+    book = parse_book(BOOK_PAGE, "/book/show/1.Test", "2025-11-01", fields={"Book Id", "ISBN13"})
+    assert book == {"Book Id": "1", "ISBN13": '="9781234567897"'}
+
+
+def test_parse_book_skips_lookups_of_unselected_fields():
+    with patch("goodreads_miner.scraper.get_book_infos") as infos, patch(
+        "goodreads_miner.scraper.get_year_first_published", return_value=2010
+    ) as year, patch("goodreads_miner.scraper.parse_name") as name:
+        book = parse_book(BOOK_PAGE, "/book/show/1", "2025-11-01", fields={"Original Publication Year"})
+
+    assert book == {"Original Publication Year": 2010}
+    infos.assert_not_called()
+    name.assert_not_called()
+    year.assert_called_once()
+
+
+def test_parse_book_without_page_fields_does_not_parse_the_page():
+    with patch("bs4.BeautifulSoup") as soup:
+        book = parse_book(BOOK_PAGE, "/book/show/1", "2025-11-01", fields={"Book Id", "Date Added"})
+
+    assert book == {"Book Id": "1", "Date Added": "2025-11-01"}
+    soup.assert_not_called()
+
+
+def test_parse_book_projection_matches_full_parse():
+    full = parse_book(BOOK_PAGE, "/book/show/1", "2025-11-01")
+    fields = {"Author l-f", "ISBN", "Number of Pages", "Average Rating"}
+    assert parse_book(BOOK_PAGE, "/book/show/1", "2025-11-01", fields=fields) == {name: full[name] for name in fields}
+
+
+# ------------------------
+# Test book_stages
+# ------------------------
+def test_book_stages_without_fields_keeps_the_stages():
+    fetch_list, scrape = object(), object()
+    assert book_stages(None, fetch_list, scrape) == (fetch_list, scrape)
+
+
+def test_book_stages_passes_fields_to_scrape():
+    calls = []
+
+    def scrape(link, today, fields=None):
+        calls.append(fields)
+        return {}
+
+    _, stage = book_stages(frozenset({"ISBN13"}), scrape=scrape)
+    stage("/book/show/1", "2025-11-01")
+    assert calls == [{"ISBN13"}]
+
+
+def test_list_books_skip_book_pages():
+    entries = {"a": [("/book/show/1.One", "One"), ("/book/show/2.Two", "Two")]}
+    books = ListBooks(frozenset({"Book Id", "Title"}), get_entries=entries.__getitem__)
+
+    with patch("goodreads_miner.scraper.fetch_page") as fetch_page:
+        result = list(Pipeline(books.fetch_list, books.scrape, "2025-11-01").run(["a"]))
+
+    assert sorted(result, key=lambda book: book["Book Id"]) == [
+        {"Book Id": "1", "Title": "One"},
+        {"Book Id": "2", "Title": "Two"},
+    ]
+    fetch_page.assert_not_called()
+
+
+def test_list_books_titles_travel_with_the_links():
+    entries = {"a": [("/book/show/1.One", "One")], "b": [("/book/show/1.One", "One"), ("/book/show/2.Two", "Two")]}
+    books = ListBooks(frozenset({"Title"}), get_entries=entries.__getitem__)
+    [one] = books.fetch_list("a")
+    links = books.fetch_list("b")
+
+    # A book on two lists keeps its title for both, and links still compare as strings
+    assert links == ["/book/show/1.One", "/book/show/2.Two"]
+    assert json.loads(json.dumps(links)) == links
+    assert books.scrape(one, "today") == {"Title": "One"}
+    assert [books.scrape(link, "today") for link in links] == [{"Title": "One"}, {"Title": "Two"}]
+    # A plain link, e.g. retried from the dead-letter file, has no title
+    assert books.scrape("/book/show/1.One", "today") == {"Title": None}
@@ -0,0 +1,98 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+import pytest
+from goodreads_miner.fetch import Fetcher
+from goodreads_miner.proxies import NoProxyAvailable, ProxyPool
+
+
+def make_proxy(name, status=200):
+    """Local stand-in forward proxy answering every request itself."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = f"{name} {self.path}".encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def proxies():
+    servers = [make_proxy("one"), make_proxy("two"), make_proxy("bad", status=502)]
+    yield [url for _, url in servers]
+    for server, _ in servers:
+        server.shutdown()
+        server.server_close()
+
+
+# ------------------------
+# Test ProxyPool
+# ------------------------
+def test_round_robin_goes_through_every_proxy(proxies):
+    pool = ProxyPool(proxies[:2])
+    bodies = [pool.download("http://www.goodreads.com/book/show/1") for _ in range(4)]
+
+    assert [body.split()[0] for body in bodies] == [b"one", b"two", b"one", b"two"]
+    assert bodies[0].split()[1] == b"http://www.goodreads.com/book/show/1"
+
+def test_failing_proxy_is_ejected(proxies):
+    pool = ProxyPool([proxies[2], proxies[0]], max_failures=2, cooldown=60)
+    answers = []
+    for _ in range(6):
+        try:
+            answers.append(pool.download("http://www.goodreads.com/").split()[0])
+        except HTTPError:
+            answers.append(b"error")
+
+    assert answers.count(b"error") == 2
+    assert answers[-2:] == [b"one", b"one"]
+    assert pool.healthy_count == 1
+    assert pool.proxies[0].to_dict()["ejected"]
+
+def test_all_proxies_ejected(proxies):
+    pool = ProxyPool([proxies[2]], max_failures=1)
+    with pytest.raises(HTTPError):
+        pool.download("http://www.goodreads.com/")
+    with pytest.raises(NoProxyAvailable):
+        pool.download("http://www.goodreads.com/")
+
+def test_ejected_proxy_comes_back_after_cooldown(proxies):
+    pool = ProxyPool([proxies[2]], max_failures=1, cooldown=0)
+    with pytest.raises(HTTPError):
+        pool.download("http://www.goodreads.com/")
+    assert pool.healthy_count == 1
+
+def test_least_loaded_prefers_idle_proxy(proxies):
+    pool = ProxyPool(proxies[:2], strategy="least-loaded")
+    busy = pool.acquire()
+    other = pool.acquire()
+    assert busy is not other
+    pool.release(other)
+    assert pool.acquire() is other
+
+def test_per_proxy_rate_limit(proxies):
+    pool = ProxyPool(proxies[:1], rate=20)
+    started = time.monotonic()
+    for _ in range(5):
+        pool.download("http://www.goodreads.com/")
+    assert time.monotonic() - started >= 0.2
+
+def test_invalid_pool():
+    with pytest.raises(ValueError):
+        ProxyPool([])
+    with pytest.raises(ValueError):
+        ProxyPool(["http://127.0.0.1:1"], strategy="random")
+
+def test_fetcher_uses_proxies(proxies):
+    body = Fetcher(proxies=ProxyPool(proxies[1:2]))("http://www.goodreads.com/list/show/1")
+    assert body == b"two http://www.goodreads.com/list/show/1"
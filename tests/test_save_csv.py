@@ -3,6 +3,7 @@ import tempfile
 import csv
 from unittest.mock import mock_open, patch, MagicMock
 from goodreads_miner import save_import
+from goodreads_miner.save_csv import DATA_FIELDS
 
 # Sample data
 sample_data = [
@@ -34,14 +35,25 @@ sample_data = [
     }
 ]
 
+def capture_rows(mock_writer_instance) -> list:
+    """Collects the rows passed to the mocked writer's writerows."""
+    written = []
+    mock_writer_instance.writerows.side_effect = written.extend
+    return written
+
+
+def expected_row(book: dict, bookshelf: str) -> list:
+    return [bookshelf if field in ("Bookshelves", "Exclusive Shelf") else book.get(field, "") for field in DATA_FIELDS]
+
 # ------------------------
 # Test default filename
 # ------------------------
 @patch("builtins.open", new_callable=mock_open)
-@patch("csv.DictWriter")
+@patch("csv.writer")
 def test_save_import_default_filename(mock_csv_writer, mock_file):
     mock_writer_instance = MagicMock()
     mock_csv_writer.return_value = mock_writer_instance
+    written = capture_rows(mock_writer_instance)
 
     save_import(sample_data)
 
@@ -49,41 +61,43 @@ def test_save_import_default_filename(mock_csv_writer, mock_file):
     args, kwargs = mock_file.call_args
     assert "data.csv" in args[0]
 
-    # Check that DictWriter wrote header and row
-    mock_writer_instance.writeheader.assert_called_once()
-    mock_writer_instance.writerow.assert_called_once_with(sample_data[0])
+    # Check that the writer wrote header and row
+    mock_writer_instance.writerow.assert_called_once_with(DATA_FIELDS)
+    assert written == [expected_row(sample_data[0], "imported by Goodreads miner")]
 
 # ------------------------
 # Test custom filename
 # ------------------------
 @patch("builtins.open", new_callable=mock_open)
-@patch("csv.DictWriter")
+@patch("csv.writer")
 def test_save_import_custom_filename(mock_csv_writer, mock_file):
     mock_writer_instance = MagicMock()
     mock_csv_writer.return_value = mock_writer_instance
+    written = capture_rows(mock_writer_instance)
 
     save_import(sample_data, filename="custom_books.csv")
 
     args, kwargs = mock_file.call_args
     assert "custom_books.csv" in args[0]
 
-    mock_writer_instance.writeheader.assert_called_once()
-    mock_writer_instance.writerow.assert_called_once_with(sample_data[0])
+    mock_writer_instance.writerow.assert_called_once_with(DATA_FIELDS)
+    assert written == [expected_row(sample_data[0], "imported by Goodreads miner")]
 
 # ------------------------
 # Test empty data
 # ------------------------
 @patch("builtins.open", new_callable=mock_open)
-@patch("csv.DictWriter")
+@patch("csv.writer")
 def test_save_import_empty_data(mock_csv_writer, mock_file):
     mock_writer_instance = MagicMock()
     mock_csv_writer.return_value = mock_writer_instance
+    written = capture_rows(mock_writer_instance)
 
     save_import([])
 
-    mock_writer_instance.writeheader.assert_called_once()
-    # writerow should not be called
-    mock_writer_instance.writerow.assert_not_called()
+    mock_writer_instance.writerow.assert_called_once_with(DATA_FIELDS)
+    # No book row should be written
+    assert written == []
 
 def read_csv(filepath: str) -> list[dict]:
     """Utility function to read back a CSV file into a list of dicts."""
@@ -154,3 +168,45 @@ def test_extra_fields_are_ignored():
 
         rows = read_csv(filepath)
         assert "RandomField" not in rows[0]
+
+
+def test_append_writes_header_once():
+    """It should add rows to an existing file without repeating the header."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, "delta.csv")
+        save_import([{"Title": "First"}], filename="delta.csv", output_dir=tmpdir, append=True)
+        save_import([{"Title": "Second"}], filename="delta.csv", output_dir=tmpdir, append=True)
+
+        rows = read_csv(filepath)
+        assert [row["Title"] for row in rows] == ["First", "Second"]
+
+
+def test_input_rows_are_not_modified():
+    """It should apply the shelf columns without touching the caller's data."""
+    data = [{"Title": "Kept", "Bookshelves": "mine"}]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_import(data, filename="out.csv", bookshelf="to-read", output_dir=tmpdir)
+        rows = read_csv(os.path.join(tmpdir, "out.csv"))
+
+    assert data == [{"Title": "Kept", "Bookshelves": "mine"}]
+    assert rows[0]["Bookshelves"] == "to-read"
+
+
+def test_output_matches_dictwriter():
+    """It should write exactly the bytes csv.DictWriter writes for the same rows."""
+    data = [
+        dict(sample_data[0]),
+        {"Title": 'Quotes "inside", commas\nand newlines', "Author": None, "Average Rating": 3.25, "Extra": 1},
+        {},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_import(data, filename="bulk.csv", bookshelf="to-read", output_dir=tmpdir)
+        with open(os.path.join(tmpdir, "reference.csv"), "w", newline="", encoding="utf8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=DATA_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in data:
+                writer.writerow({**row, "Bookshelves": "to-read", "Exclusive Shelf": "to-read"})
+        with open(os.path.join(tmpdir, "bulk.csv"), "rb") as bulk, open(os.path.join(tmpdir, "reference.csv"), "rb") as reference:
+            assert bulk.read() == reference.read()
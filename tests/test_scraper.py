@@ -7,6 +7,7 @@ from goodreads_miner.scraper import (
     get_book_infos,
     get_year_first_published,
     get_id,
+    parse_list_entries,
     parse_name,
     scrape_book,
 )
@@ -66,6 +67,17 @@ def test_get_books(mock_urlopen):
         assert urls == ["/book/show/1", "/book/show/2"]
 
 
+# ------------------------
+# Test parse_list_entries
+# ------------------------
+def test_parse_list_entries():
+    html_content = """
+    <a class="bookTitle" href="/book/show/1.One"><span itemprop="name">The &amp; One</span></a>
+    <a class="bookTitle" href="/book/show/2.Two">Two</a>
+    """
+    assert parse_list_entries(html_content) == [("/book/show/1.One", "The & One"), ("/book/show/2.Two", "Two")]
+
+
 # ------------------------
 # Test get_book_infos
 # ------------------------
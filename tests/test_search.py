@@ -0,0 +1,96 @@
+import json
+import sys
+from unittest.mock import patch
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner.pipeline import Pipeline
+from goodreads_miner.save_csv import save_import
+from goodreads_miner.search import SearchIndex, parse_query, tokenize
+
+BOOKS = [
+    {"Book Id": "1", "Title": "A Wizard of Earthsea", "Author": "Ursula K. Le Guín", "ISBN13": '="9780547773742"'},
+    {"Book Id": "2", "Title": "The Left Hand of Darkness", "Author": "Ursula K. Le Guin", "ISBN13": '="9780441478125"'},
+    {"Book Id": "3", "Title": "Good Omens", "Author": "Terry Pratchett", "Additional Authors": "Neil Gaiman"},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(tmp_path / "books.index") as index:
+        index.add(BOOKS[0], "https://www.goodreads.com/list/show/1.Fantasy")
+        index.add(BOOKS[1], "https://www.goodreads.com/list/show/2.SF")
+        index.add(BOOKS[2])
+        yield index
+
+
+def ids(results):
+    return [book["Book Id"] for book in results]
+
+
+# ------------------------
+# Test query parsing
+# ------------------------
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Ursula K. Le Guín") == ["ursula", "k", "le", "guin"]
+    assert tokenize(None) == []
+
+def test_parse_query():
+    assert parse_query("author:guin earth*") == [("author", "guin", False), (None, "earth", True)]
+    assert parse_query("le-gu*") == [(None, "le", False), (None, "gu", True)]
+
+
+# ------------------------
+# Test SearchIndex
+# ------------------------
+def test_term_queries_match_every_term(index):
+    assert ids(index.search("ursula")) == ["1", "2"]
+    assert ids(index.search("ursula darkness")) == ["2"]
+    assert index.search("ursula gaiman") == []
+
+def test_prefix_queries(index):
+    assert ids(index.search("earth*")) == ["1"]
+    assert ids(index.search("gu*")) == ["1", "2"]
+    assert index.search("earth") == []
+
+def test_field_queries(index):
+    assert ids(index.search("author:gaiman")) == ["3"]
+    assert index.search("title:gaiman") == []
+    assert ids(index.search("isbn:9780441478125")) == ["2"]
+
+def test_results_include_lists(index):
+    index.add(BOOKS[0], "https://www.goodreads.com/list/show/2.SF")
+    [book] = index.search("wizard")
+    assert book["Title"] == "A Wizard of Earthsea"
+    assert book["Lists"] == ["https://www.goodreads.com/list/show/1.Fantasy", "https://www.goodreads.com/list/show/2.SF"]
+
+def test_readding_a_book_replaces_its_terms(index):
+    index.add({**BOOKS[2], "Title": "Good Omens (Illustrated)"})
+    assert ids(index.search("illustrated")) == ["3"]
+    index.add(BOOKS[2])
+    assert index.search("illustrated") == []
+    assert len(index) == 3
+
+def test_index_persists(index):
+    index.close()
+    with SearchIndex(index.path) as reopened:
+        assert ids(reopened.search("omens")) == ["3"]
+
+def test_pipeline_indexes_books(tmp_path):
+    with SearchIndex(tmp_path / "books.index") as index:
+        pipeline = Pipeline(lambda url: ["/book/show/1"], lambda link, today: BOOKS[0], "today", on_book=index)
+        list(pipeline.run(["https://www.goodreads.com/list/show/1.Fantasy"]))
+        assert index.search("earthsea")[0]["Lists"] == ["https://www.goodreads.com/list/show/1.Fantasy"]
+
+
+# ------------------------
+# Test index and search commands
+# ------------------------
+def test_main_index_and_search(tmp_path, capsys):
+    save_import(BOOKS, "books.csv", output_dir=str(tmp_path))
+    with patch.object(sys, "argv", ["main.py", "index", str(tmp_path / "books.csv"), "--output_dir", str(tmp_path)]):
+        main_module.main()
+    with patch.object(sys, "argv", ["main.py", "search", "le", "gu*", "--json", "--output_dir", str(tmp_path)]):
+        main_module.main()
+    output = capsys.readouterr().out
+    results = json.loads(output[output.index("["):])
+    assert ids(results) == ["1", "2"]
@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import pytest
+from goodreads_miner.service import BookMemo, Service
+
+scraped = []
+
+
+def fake_get_books(url):
+    return ["/book/show/1", "/book/show/2"]
+
+
+def fake_scrape(link, today):
+    scraped.append(link)
+    return {"Book Id": link.split("/")[-1], "Title": f"Book {link[-1]}"}
+
+
+@pytest.fixture
+def api(tmp_path):
+    scraped.clear()
+    service = Service(tmp_path, fetch_list=fake_get_books, scrape=fake_scrape)
+    server = service.make_server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def call(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    with urlopen(Request(url, data=data)) as response:
+        body = response.read()
+        if response.headers["Content-Type"] == "application/json":
+            return json.loads(body)
+        return body.decode("utf8")
+
+
+def wait_done(api, job_id):
+    for _ in range(100):
+        job = call(f"{api}/jobs/{job_id}")
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+# ------------------------
+# Test BookMemo
+# ------------------------
+def test_book_memo_returns_copies():
+    scraped.clear()
+    memo = BookMemo(fake_scrape)
+    first = memo("/book/show/1", "2025-01-01")
+    first["Bookshelves"] = "changed"
+    second = memo("/book/show/1", "2025-02-01")
+
+    assert scraped == ["/book/show/1"]
+    assert "Bookshelves" not in second
+    assert second["Date Added"] == "2025-02-01"
+
+
+def test_book_memo_expires_books():
+    scraped.clear()
+    memo = BookMemo(fake_scrape, ttl=60)
+    memo("/book/show/1", "today")
+    with patch("goodreads_miner.service.time.monotonic", return_value=time.monotonic() + 61):
+        memo("/book/show/1", "today")
+
+    assert scraped == ["/book/show/1", "/book/show/1"]
+
+
+def test_book_memo_skips_incomplete_books():
+    calls = []
+
+    def scrape(link, today):
+        calls.append(link)
+        return {"Book Id": "1", "Title": None}
+
+    memo = BookMemo(scrape)
+    memo("/book/show/1", "today")
+    memo("/book/show/1", "today")
+
+    assert calls == ["/book/show/1", "/book/show/1"]
+    assert len(memo) == 0
+
+
+# ------------------------
+# Test HTTP API
+# ------------------------
+def test_job_lifecycle(api):
+    job = call(f"{api}/jobs", {"url": "https://www.goodreads.com/list/show/1.Best", "bookshelf": "to-read"})
+    assert job["status"] in ("queued", "running", "done")
+
+    job = wait_done(api, job["id"])
+    assert job["status"] == "done"
+    assert job["books"] == 2
+
+    content = call(f"{api}/jobs/{job['id']}/csv")
+    assert "Book 1" in content and "to-read" in content
+
+def test_memo_stays_warm_across_jobs(api):
+    for _ in range(2):
+        job = call(f"{api}/jobs", {"urls": ["https://a"]})
+        wait_done(api, job["id"])
+    assert sorted(scraped) == ["/book/show/1", "/book/show/2"]
+    assert call(f"{api}/health")["memo"] == 2
+
+def test_failed_book_does_not_fail_the_job(tmp_path):
+    def scrape(link, today):
+        if link.endswith("/2"):
+            raise ValueError("boom")
+        return fake_scrape(link, today)
+
+    service = Service(tmp_path, fetch_list=fake_get_books, scrape=scrape)
+    job = service.submit(["https://a"])
+    service.shutdown()
+
+    assert job.status == "done"
+    assert job.to_dict()["failures"] == 1
+    assert "Book 1" in job.path.read_text(encoding="utf8")
+    [entry] = job.failed.entries()
+    assert (entry["url"], entry["error"]) == ("/book/show/2", "ValueError: boom")
+
+def test_bad_requests(api):
+    with pytest.raises(HTTPError) as info:
+        call(f"{api}/jobs", {"nothing": True})
+    assert info.value.code == 400
+    with pytest.raises(HTTPError) as info:
+        call(f"{api}/jobs", {"urls": "https://www.goodreads.com/list/show/1.Best"})
+    assert info.value.code == 400
+    with pytest.raises(HTTPError) as info:
+        call(f"{api}/jobs/unknown")
+    assert info.value.code == 404
@@ -0,0 +1,83 @@
+import json
+import math
+import sys
+from unittest.mock import patch
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner.save_csv import save_import
+
+np = pytest.importorskip("numpy")
+
+from goodreads_miner.stats import compute_stats, format_stats, load_columns, save_columns, to_numbers  # noqa: E402
+
+BOOKS = [
+    {"Book Id": "1", "Author": "Le Guin, Ursula", "Average Rating": 4.5, "Number of Pages": 250, "Original Publication Year": 1969},
+    {"Book Id": "2", "Author": "Le Guin, Ursula", "Average Rating": 4.1, "Number of Pages": 380, "Original Publication Year": 1974},
+    {"Book Id": "3", "Author": "Herbert, Frank", "Average Rating": 4.3, "Number of Pages": 900, "Original Publication Year": 1965},
+    {"Book Id": "4", "Author": "Banks, Iain", "Average Rating": 3.9, "Number of Pages": None, "Original Publication Year": None},
+]
+
+
+@pytest.fixture
+def import_csv(tmp_path):
+    save_import(BOOKS, "books.csv", output_dir=str(tmp_path))
+    return tmp_path / "books.csv"
+
+
+# ------------------------
+# Test loading
+# ------------------------
+def test_to_numbers_handles_blanks_and_garbage():
+    values = to_numbers(["4.5", "", "n/a", "1969"])
+    assert values[0] == 4.5 and values[3] == 1969
+    assert math.isnan(values[1]) and math.isnan(values[2])
+
+def test_load_columns_from_csv(import_csv):
+    columns = load_columns([import_csv])
+    assert list(columns["Book Id"]) == ["1", "2", "3", "4"]
+    assert columns["Number of Pages"][1] == 380
+    assert math.isnan(columns["Number of Pages"][3])
+
+def test_load_columns_keeps_first_row_per_book(import_csv, tmp_path):
+    save_import([{**BOOKS[0], "Average Rating": 1.0}], "again.csv", output_dir=str(tmp_path))
+    columns = load_columns([import_csv, tmp_path / "again.csv"])
+    assert len(columns["Book Id"]) == 4
+    assert columns["Average Rating"][0] == 4.5
+
+def test_npz_round_trip(import_csv, tmp_path):
+    columns = load_columns([import_csv])
+    save_columns(columns, tmp_path / "books.npz")
+    reloaded = load_columns([tmp_path / "books.npz"])
+    assert compute_stats(reloaded) == compute_stats(columns)
+
+
+# ------------------------
+# Test aggregates
+# ------------------------
+def test_compute_stats(import_csv):
+    stats = compute_stats(load_columns([import_csv]), top=2)
+    assert stats["books"] == 4 and stats["authors"] == 3
+    assert stats["rating"]["count"] == 4
+    assert stats["rating"]["mean"] == pytest.approx(4.2)
+    assert stats["pages"]["count"] == 3 and stats["pages"]["max"] == 900
+    assert stats["rating_histogram"] == [("3.5-4", 1), ("4-4.5", 2), ("4.5-5", 1)]
+    assert stats["pages_histogram"] == [("200-300", 1), ("300-400", 1), ("750-1000", 1)]
+    assert stats["decades"] == [(1960, 2), (1970, 1)]
+    assert stats["top_authors"] == [("Le Guin, Ursula", 2), ("Banks, Iain", 1)]
+
+def test_compute_stats_without_values(tmp_path):
+    save_import([{"Book Id": "1"}], "empty.csv", output_dir=str(tmp_path))
+    stats = compute_stats(load_columns([tmp_path / "empty.csv"]))
+    assert stats["rating"] == {"count": 0}
+    assert "Average Rating: no values" in format_stats(stats)
+
+
+# ------------------------
+# Test stats command
+# ------------------------
+def test_main_stats_json(import_csv, capsys):
+    with patch.object(sys, "argv", ["main.py", "stats", str(import_csv), "--json", "--top", "1"]):
+        main_module.main()
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["books"] == 4
+    assert stats["top_authors"] == [["Le Guin, Ursula", 2]]
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.error import HTTPError
+import pytest
+from goodreads_miner import main as main_module
+from goodreads_miner import tracing
+from goodreads_miner.fetch import ConnectionPool, Fetcher
+from goodreads_miner.scraper import scrape_book
+from goodreads_miner.tracing import Tracer, set_tracer, span
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/list/"):
+            body = b'<html><a class="bookTitle" href="/book/show/1.A">A</a></html>'
+        else:
+            body = b"<html>page</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = Tracer(tmp_path / "run.trace.json")
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+    tracer.close()
+
+
+def read_spans(tracer):
+    tracer.close()
+    with open(tracer.path, encoding="utf8") as file:
+        events = json.load(file)
+    return [event for event in events if event["ph"] == "X"]
+
+
+# ------------------------
+# Test Tracer
+# ------------------------
+def test_span_is_a_noop_without_tracer():
+    assert not tracing.enabled()
+    with span("anything", url="x") as trace:
+        trace["bytes"] = 1
+
+def test_nested_spans_are_written(tracer):
+    with span("outer", url="a"):
+        with span("inner") as trace:
+            trace["bytes"] = 3
+    outer, inner = sorted(read_spans(tracer), key=lambda event: event["ts"])
+    assert (outer["name"], inner["name"]) == ("outer", "inner")
+    assert outer["args"] == {"url": "a"} and inner["args"] == {"bytes": 3}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["tid"] == inner["tid"]
+
+def test_failed_span_records_error(tracer):
+    with pytest.raises(ValueError):
+        with span("broken"):
+            raise ValueError("bad page")
+    [event] = read_spans(tracer)
+    assert event["args"]["error"] == "ValueError: bad page"
+
+def test_span_after_close_still_raises(tracer):
+    tracer.close()
+    with pytest.raises(ValueError):
+        with tracer.span("late"):
+            raise ValueError("boom")
+    assert tracer.spans == 0
+
+
+def test_threads_are_named(tracer):
+    def work():
+        with span("work"):
+            pass
+    thread = threading.Thread(target=work, name="book-1")
+    thread.start()
+    thread.join()
+    tracer.close()
+    with open(tracer.path, encoding="utf8") as file:
+        events = json.load(file)
+    assert {"name": "book-1"} in [event["args"] for event in events if event["name"] == "thread_name"]
+
+def test_unclosed_trace_is_readable(tracer):
+    with span("one"):
+        pass
+    tracer._file.flush()
+    text = tracer.path.read_text(encoding="utf8")
+    # Trace viewers accept a JSON array without its closing bracket
+    events = json.loads(text.rstrip().rstrip(",") + "]")
+    assert "one" in [event["name"] for event in events]
+
+
+# ------------------------
+# Test instrumented code
+# ------------------------
+def test_pool_request_phases(server, tracer):
+    pool = ConnectionPool()
+    Fetcher(pool=pool)(f"{server}/page")
+    Fetcher(pool=pool)(f"{server}/page")
+    pool.close()
+    names = [event["name"] for event in sorted(read_spans(tracer), key=lambda event: event["ts"])]
+    # Only the first request opens a connection
+    assert names == ["download", "dns", "connect", "request", "wait", "body", "download", "request", "wait", "body"]
+
+def test_urlopen_request_phases(server, tracer):
+    assert Fetcher()(f"{server}/page") == b"<html>page</html>"
+    names = [event["name"] for event in sorted(read_spans(tracer), key=lambda event: event["ts"])]
+    assert names == ["download", "dns", "connect", "request", "wait", "body"]
+
+
+def test_traced_requests_still_use_the_proxy_settings(server, tracer):
+    # The local server answers the proxied request for a host that does not resolve.
+    # Like urlopen's, the opener reads the proxy settings once, when it is built.
+    with patch.dict(os.environ, {"http_proxy": server, "no_proxy": ""}), patch("goodreads_miner.fetch._traced_opener", None):
+        assert Fetcher()("http://goodreads.invalid/page") == b"<html>page</html>"
+    dns = [event for event in read_spans(tracer) if event["name"] == "dns"]
+    assert [event["args"]["host"] for event in dns] == ["127.0.0.1"]
+
+@patch("goodreads_miner.scraper.time.sleep")
+@patch("goodreads_miner.scraper.fetch_page")
+def test_scrape_book_phases(mock_fetch, mock_sleep, tracer):
+    mock_fetch.side_effect = [HTTPError("url", 503, "busy", {}, None), b"<html></html>"]
+    scrape_book("/book/show/1.A", "2024-01-01")
+    spans = sorted(read_spans(tracer), key=lambda event: event["ts"])
+    assert [event["name"] for event in spans] == ["scrape_book", "fetch", "retry sleep", "fetch", "parse"]
+    assert spans[1]["args"]["error"].startswith("HTTPError")
+    assert spans[3]["args"] == {"retry": True}
+
+@patch("goodreads_miner.main.get_books", return_value=["/book/show/1.A"])
+@patch("goodreads_miner.main.scrape_book", return_value={"Book Id": "1", "Title": "A"})
+def test_main_trace_option(mock_scrape, mock_get_books, tmp_path):
+    trace_path = tmp_path / "run.trace.json"
+    test_argv = ["main.py", "--url", "https://www.goodreads.com/list/show/1.A", "--quiet",
+                 "--output_dir", str(tmp_path), "--trace", str(trace_path)]
+    with patch("sys.argv", test_argv):
+        main_module.main()
+    assert not tracing.enabled()
+    with open(trace_path, encoding="utf8") as file:
+        events = json.load(file)
+    assert "save_import" in [event["name"] for event in events]
+
+
+def test_main_trace_records_request_phases(server, tmp_path):
+    lists = tmp_path / "lists.txt"
+    lists.write_text(f"{server}/list/show/1.A\n", encoding="utf8")
+    trace_path = tmp_path / "run.trace.json"
+    test_argv = ["main.py", "--file", str(lists), "--quiet", "--output_dir", str(tmp_path), "--trace", str(trace_path)]
+    with patch("sys.argv", test_argv), patch("goodreads_miner.scraper.GOODREADS_URL", server):
+        main_module.main()
+    with open(trace_path, encoding="utf8") as file:
+        names = {event["name"] for event in json.load(file)}
+    assert {"get_books", "scrape_book", "download", "dns", "connect", "request", "wait", "body"} <= names
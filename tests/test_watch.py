@@ -0,0 +1,150 @@
+import csv
+import sys
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+from goodreads_miner import main as main_module
+from goodreads_miner.watch import ListWatcher, poll, watch
+
+LIST_URL = "https://www.goodreads.com/list/show/1.Best"
+
+
+class FakeList:
+    def __init__(self, links):
+        self.links = links
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        return list(self.links)
+
+
+def fake_scrape(link, today):
+    scraped.append(link)
+    return {"Book Id": link.split("/")[-1].split(".")[0], "Title": link}
+
+
+scraped = []
+
+
+def read_csv(path):
+    with open(path, encoding="utf8") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+# ------------------------
+# Test ListWatcher
+# ------------------------
+def test_first_poll_records_baseline(tmp_path):
+    watcher = ListWatcher(tmp_path / "state.json", FakeList(["/book/show/1.A", "/book/show/2.B"]))
+    assert watcher.new_links(LIST_URL) == []
+    assert watcher.state[LIST_URL]["ids"] == ["1", "2"]
+
+def test_unchanged_list_yields_nothing(tmp_path):
+    watcher = ListWatcher(tmp_path / "state.json", FakeList(["/book/show/1.A"]))
+    watcher.new_links(LIST_URL)
+    assert watcher.new_links(LIST_URL) == []
+    assert watcher.unchanged == 1
+
+def test_only_added_books_are_returned(tmp_path):
+    fake_list = FakeList(["/book/show/1.A", "/book/show/2.B"])
+    watcher = ListWatcher(tmp_path / "state.json", fake_list)
+    watcher.new_links(LIST_URL)
+    # Reordered, one removed, one added
+    fake_list.links = ["/book/show/3.C", "/book/show/1.A"]
+    assert watcher.new_links(LIST_URL) == ["/book/show/3.C"]
+    # A book removed then added back is not new
+    fake_list.links = ["/book/show/2.B", "/book/show/3.C", "/book/show/1.A"]
+    assert watcher.new_links(LIST_URL) == []
+
+def test_state_survives_restarts(tmp_path):
+    fake_list = FakeList(["/book/show/1.A"])
+    watcher = ListWatcher(tmp_path / "state.json", fake_list)
+    watcher.new_links(LIST_URL)
+    watcher.save()
+
+    fake_list.links = ["/book/show/1.A", "/book/show/2.B"]
+    assert ListWatcher(tmp_path / "state.json", fake_list).new_links(LIST_URL) == ["/book/show/2.B"]
+
+
+# ------------------------
+# Test poll
+# ------------------------
+def test_poll_appends_new_books_to_delta(tmp_path):
+    scraped.clear()
+    fake_list = FakeList(["/book/show/1.A"])
+    watcher = ListWatcher(tmp_path / "state.json", fake_list)
+    delta = tmp_path / "delta.csv"
+
+    assert poll(watcher, [LIST_URL], delta, scrape=fake_scrape) == []
+    assert not delta.exists()
+
+    fake_list.links = ["/book/show/1.A", "/book/show/2.B"]
+    poll(watcher, [LIST_URL], delta, scrape=fake_scrape)
+    fake_list.links = ["/book/show/1.A", "/book/show/2.B", "/book/show/3.C"]
+    poll(watcher, [LIST_URL], delta, scrape=fake_scrape)
+    poll(watcher, [LIST_URL], delta, scrape=fake_scrape)
+
+    assert scraped == ["/book/show/2.B", "/book/show/3.C"]
+    assert [row["Book Id"] for row in read_csv(delta)] == ["2", "3"]
+
+
+def test_poll_retries_failed_books_at_the_next_poll(tmp_path):
+    fake_list = FakeList(["/book/show/1.A"])
+    watcher = ListWatcher(tmp_path / "state.json", fake_list)
+    delta = tmp_path / "delta.csv"
+    poll(watcher, [LIST_URL], delta, scrape=fake_scrape)
+
+    def broken_scrape(link, today):
+        raise HTTPError(link, 503, "Service Unavailable", {}, None)
+
+    failures = []
+    fake_list.links = ["/book/show/1.A", "/book/show/2.B"]
+    assert poll(watcher, [LIST_URL], delta, scrape=broken_scrape, on_failure=lambda *failure: failures.append(failure)) == []
+    assert watcher.failed == 1
+    assert [(list_url, link) for list_url, link, _ in failures] == [(LIST_URL, "/book/show/2.B")]
+
+    # The list is unchanged, but the failed book is returned again
+    scraped.clear()
+    poll(watcher, [LIST_URL], delta, scrape=fake_scrape)
+    assert watcher.failed == 0
+    assert scraped == ["/book/show/2.B"]
+    assert [row["Book Id"] for row in read_csv(delta)] == ["2"]
+
+
+def test_poll_keeps_state_of_failed_lists(tmp_path):
+    fake_list = FakeList(["/book/show/1.A"])
+    watcher = ListWatcher(tmp_path / "state.json", fake_list)
+    poll(watcher, [LIST_URL], tmp_path / "delta.csv", scrape=fake_scrape)
+
+    def broken_list(url):
+        raise URLError("unreachable")
+
+    watcher.fetch_list = broken_list
+    assert poll(watcher, [LIST_URL], tmp_path / "delta.csv", scrape=fake_scrape) == []
+    assert watcher.failed == 1
+    assert watcher.state[LIST_URL]["ids"] == ["1"]
+
+
+def test_watch_keeps_polling_after_a_failed_poll(tmp_path, capsys):
+    watcher = ListWatcher(tmp_path / "state.json", FakeList(["/book/show/1.A"]))
+    with patch("goodreads_miner.watch.poll", side_effect=[OSError("disk full"), []]) as mock_poll:
+        watch(watcher, [LIST_URL], tmp_path / "delta.csv", interval=0, polls=2)
+    assert mock_poll.call_count == 2
+    assert "Poll failed: OSError: disk full" in capsys.readouterr().err
+
+
+# ------------------------
+# Test watch command
+# ------------------------
+@patch("goodreads_miner.watch.scrape_book", side_effect=fake_scrape)
+def test_main_watch_command(mock_scrape, tmp_path):
+    scraped.clear()
+    fake_list = FakeList(["/book/show/1.A"])
+    test_argv = ["main.py", "watch", "--url", LIST_URL, "--polls", "1", "--output_dir", str(tmp_path)]
+    with patch("goodreads_miner.watch.get_books", fake_list), patch.object(sys, "argv", test_argv):
+        main_module.main()
+        fake_list.links = ["/book/show/1.A", "/book/show/2.B"]
+        main_module.main()
+    assert fake_list.calls == 2
+    assert scraped == ["/book/show/2.B"]
+    assert [row["Book Id"] for row in read_csv(tmp_path / "1 - Best.delta.csv")] == ["2"]